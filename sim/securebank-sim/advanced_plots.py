@@ -8,16 +8,100 @@ Módulo de visualizações para análises avançadas do SecureBank™:
 4. Sensibilidade de parâmetros
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List
 
+from advanced_metrics import (
+    CLASSIFICATION_METRICS,
+    FINANCIAL_IMPACT_KEYS,
+    fp_fn_matrix,
+    roi_years,
+    scalability_table,
+    sensitivity_matrix,
+)
 
-# Configuração global do estilo
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+
+# 200 dpi é suficiente para o artigo (~2.25x menos pixels que 300)
+SAVE_DPI = 200
+
+# matplotlib/seaborn só são importados no primeiro gráfico: quem importa
+# este módulo sem plotar (ex.: --no-plots) não paga esse custo
+plt = None
+mtransforms = None
+sns = None
+_figure = None
+
+
+def _ensure_style():
+    """Importa as bibliotecas de plot e aplica o estilo global uma única vez."""
+    global plt, mtransforms, sns
+    if plt is None:
+        import matplotlib
+        # só gera arquivos: backend não interativo. mplcairo (opcional)
+        # rasteriza e grava PNG mais rápido que o Agg, com a mesma API.
+        try:
+            import mplcairo  # type: ignore  # noqa: F401
+            matplotlib.use('module://mplcairo.base')
+        except ImportError:  # mplcairo é opcional
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as _plt
+        import matplotlib.transforms as _mtransforms
+        import seaborn as _sns
+        
+        _plt.style.use('seaborn-v0_8-darkgrid')
+        _sns.set_palette("husl")
+        plt, mtransforms, sns = _plt, _mtransforms, _sns
+
+
+def _new_figure(figsize, nrows: int = 1, ncols: int = 1):
+    """
+    Reaproveita uma única Figure entre os gráficos: limpa, redimensiona e
+    cria os eixos (mesmo retorno de plt.subplots).
+    """
+    global _figure
+    _ensure_style()
+    if _figure is None:
+        _figure = plt.figure()
+    _figure.clear()
+    _figure.set_size_inches(*figsize)
+    return _figure, _figure.subplots(nrows, ncols)
+
+
+def _heatmap(ax, matrix, annot, xticklabels, yticklabels, cmap: str,
+             linewidth: float, cbar_label: str = None):
+    """
+    Heatmap anotado com imshow + ax.text (no lugar de sns.heatmap, que para
+    matrizes pequenas gasta mais em validação/layout do que no desenho).
+    O texto é preto ou branco conforme a luminância da célula.
+    """
+    im = ax.imshow(matrix, cmap=cmap, aspect='auto', interpolation='nearest')
+    ax.figure.colorbar(im, ax=ax, label=cbar_label)
+    
+    rows, cols = matrix.shape
+    ax.set_xticks(np.arange(cols), labels=xticklabels)
+    ax.set_yticks(np.arange(rows), labels=yticklabels, rotation=90, va='center')
+    ax.tick_params(which='both', length=0)
+    
+    # bordas entre as células
+    ax.set_xticks(np.arange(cols + 1) - 0.5, minor=True)
+    ax.set_yticks(np.arange(rows + 1) - 0.5, minor=True)
+    ax.grid(False)
+    ax.grid(which='minor', color='black', linewidth=linewidth)
+    
+    rgb = im.cmap(im.norm(matrix))[..., :3]
+    luminance = rgb @ np.array([0.2126, 0.7152, 0.0722])
+    for (i, j), text in np.ndenumerate(annot):
+        ax.text(j, i, text, ha='center', va='center',
+                color='black' if luminance[i, j] > 0.408 else 'white')
+
+
+def _save(fig, path: Path):
+    """Layout justo calculado uma vez e gravação sem bbox_inches='tight'."""
+    fig.tight_layout()
+    fig.savefig(path, dpi=SAVE_DPI)
 
 
 # =========================================================================
@@ -27,18 +111,13 @@ sns.set_palette("husl")
 def plot_roi_analysis(roi_data: Dict[str, Any], output_dir: Path):
     """
     Cria visualizações para análise de ROI.
+    output_dir deve existir (criado por generate_all_advanced_plots).
     """
-    output_dir.mkdir(exist_ok=True, parents=True)
-    
     # 1.1 Gráfico de ROI ao longo dos anos
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure((10, 6))
     
     years = [1, 3, 5]
-    roi_values = [
-        roi_data["roi"]["year_1"],
-        roi_data["roi"]["year_3"],
-        roi_data["roi"]["year_5"]
-    ]
+    roi_values = roi_years(roi_data)
     
     bars = ax.bar(years, roi_values, color=['#e74c3c', '#3498db', '#2ecc71'], 
                   alpha=0.7, edgecolor='black', linewidth=1.5)
@@ -52,18 +131,12 @@ def plot_roi_analysis(roi_data: Dict[str, Any], output_dir: Path):
     ax.grid(True, alpha=0.3)
     
     # Adiciona valores no topo das barras
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.1f}%',
-                ha='center', va='bottom', fontsize=11, fontweight='bold')
+    ax.bar_label(bars, fmt='{:.1f}%', fontsize=11, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'roi_over_time.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'roi_over_time.png')
     
     # 1.2 Gráfico de Payback Period
-    fig, ax = plt.subplots(figsize=(8, 6))
+    fig, ax = _new_figure((8, 6))
     
     payback_months = roi_data["roi"]["payback_months"]
     payback_years = roi_data["roi"]["payback_years"]
@@ -77,12 +150,10 @@ def plot_roi_analysis(roi_data: Dict[str, Any], output_dir: Path):
             ha='center', va='center', fontsize=11, fontweight='bold', color='white')
     ax.grid(True, alpha=0.3, axis='x')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'payback_period.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'payback_period.png')
     
     # 1.3 Gráfico de Custos vs Benefícios
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure((10, 6))
     
     categories = ['Implementation\nCost', 'Annual\nOperational', 'Annual\nBenefits', 'Net Annual\nBenefit']
     values = [
@@ -101,15 +172,10 @@ def plot_roi_analysis(roi_data: Dict[str, Any], output_dir: Path):
     ax.grid(True, alpha=0.3, axis='y')
     
     # Formata valores em k
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'${height/1000:.1f}K',
-                ha='center', va='bottom', fontsize=10, fontweight='bold')
+    ax.bar_label(bars, labels=[f'${v/1000:.1f}K' for v in values],
+                 fontsize=10, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'cost_benefit_breakdown.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'cost_benefit_breakdown.png')
     
     print(f"  ✓ ROI plots saved to {output_dir}")
 
@@ -121,52 +187,34 @@ def plot_roi_analysis(roi_data: Dict[str, Any], output_dir: Path):
 def plot_confusion_matrices(fp_fn_data: Dict[str, Any], output_dir: Path):
     """
     Cria visualizações de matrizes de confusão e métricas.
+    output_dir deve existir (criado por generate_all_advanced_plots).
     """
-    output_dir.mkdir(exist_ok=True, parents=True)
-    
     # 2.1 Matrizes de confusão lado a lado
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    fig, axes = _new_figure((14, 6), 1, 2)
     
     for idx, (system, ax) in enumerate(zip(['baseline', 'securebank'], axes)):
         cm = fp_fn_data[system]["confusion_matrix"]
         
         # Matriz 2x2
-        matrix = np.array([
-            [cm["TP"], cm["FN"]],
-            [cm["FP"], cm["TN"]]
-        ])
+        matrix = np.fromiter((cm[k] for k in ("TP", "FN", "FP", "TN")),
+                             dtype=np.int64, count=4).reshape(2, 2)
         
         # Heatmap
-        sns.heatmap(matrix, annot=True, fmt='d', cmap='Blues', cbar=True,
-                   xticklabels=['Predicted\nPositive', 'Predicted\nNegative'],
-                   yticklabels=['Actual\nPositive', 'Actual\nNegative'],
-                   ax=ax, linewidths=2, linecolor='black')
+        _heatmap(ax, matrix, matrix.astype(str), cmap='Blues', linewidth=2,
+                 xticklabels=['Predicted\nPositive', 'Predicted\nNegative'],
+                 yticklabels=['Actual\nPositive', 'Actual\nNegative'])
         
         title = 'Baseline System' if system == 'baseline' else 'SecureBank™'
         ax.set_title(f'Confusion Matrix: {title}', fontsize=13, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'confusion_matrices.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'confusion_matrices.png')
     
     # 2.2 Comparação de métricas de classificação
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure((12, 6))
     
     metrics_names = ['Precision', 'Recall', 'F1-Score', 'Accuracy', 'Specificity']
-    baseline_values = [
-        fp_fn_data["baseline"]["metrics"]["precision"],
-        fp_fn_data["baseline"]["metrics"]["recall"],
-        fp_fn_data["baseline"]["metrics"]["f1_score"],
-        fp_fn_data["baseline"]["metrics"]["accuracy"],
-        fp_fn_data["baseline"]["metrics"]["specificity"]
-    ]
-    securebank_values = [
-        fp_fn_data["securebank"]["metrics"]["precision"],
-        fp_fn_data["securebank"]["metrics"]["recall"],
-        fp_fn_data["securebank"]["metrics"]["f1_score"],
-        fp_fn_data["securebank"]["metrics"]["accuracy"],
-        fp_fn_data["securebank"]["metrics"]["specificity"]
-    ]
+    # linhas: baseline, securebank (colunas na ordem de CLASSIFICATION_METRICS)
+    baseline_values, securebank_values = fp_fn_matrix(fp_fn_data, "metrics", CLASSIFICATION_METRICS)
     
     x = np.arange(len(metrics_names))
     width = 0.35
@@ -186,30 +234,15 @@ def plot_confusion_matrices(fp_fn_data: Dict[str, Any], output_dir: Path):
     
     # Adiciona valores
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.3f}',
-                    ha='center', va='bottom', fontsize=9)
+        ax.bar_label(bars, fmt='{:.3f}', fontsize=9)
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'classification_metrics.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'classification_metrics.png')
     
     # 2.3 Impacto financeiro de FP e FN
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure((10, 6))
     
     categories = ['FP Cost', 'FN Cost', 'Total Cost']
-    baseline_costs = [
-        fp_fn_data["baseline"]["financial_impact"]["fp_cost"],
-        fp_fn_data["baseline"]["financial_impact"]["fn_cost"],
-        fp_fn_data["baseline"]["financial_impact"]["total_cost"]
-    ]
-    securebank_costs = [
-        fp_fn_data["securebank"]["financial_impact"]["fp_cost"],
-        fp_fn_data["securebank"]["financial_impact"]["fn_cost"],
-        fp_fn_data["securebank"]["financial_impact"]["total_cost"]
-    ]
+    baseline_costs, securebank_costs = fp_fn_matrix(fp_fn_data, "financial_impact", FINANCIAL_IMPACT_KEYS)
     
     x = np.arange(len(categories))
     width = 0.35
@@ -228,19 +261,11 @@ def plot_confusion_matrices(fp_fn_data: Dict[str, Any], output_dir: Path):
     ax.grid(True, alpha=0.3, axis='y')
     
     # Formata valores
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            if height >= 1000:
-                label = f'${height/1000:.1f}K'
-            else:
-                label = f'${height:.0f}'
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    label, ha='center', va='bottom', fontsize=9)
-    
-    plt.tight_layout()
-    plt.savefig(output_dir / 'financial_impact_fp_fn.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    for bars, costs in [(bars1, baseline_costs), (bars2, securebank_costs)]:
+        labels = [f'${c/1000:.1f}K' if c >= 1000 else f'${c:.0f}' for c in costs]
+        ax.bar_label(bars, labels=labels, fontsize=9)
+    
+    _save(fig, output_dir / 'financial_impact_fp_fn.png')
     
     print(f"  ✓ FP/FN plots saved to {output_dir}")
 
@@ -252,22 +277,20 @@ def plot_confusion_matrices(fp_fn_data: Dict[str, Any], output_dir: Path):
 def plot_scalability_analysis(scalability_data: Dict[str, Any], output_dir: Path):
     """
     Cria visualizações de escalabilidade.
+    output_dir deve existir (criado por generate_all_advanced_plots).
     """
-    output_dir.mkdir(exist_ok=True, parents=True)
-    
-    load_levels = scalability_data["load_levels"]
-    results = scalability_data["results"]
-    
-    # Extrai métricas
-    latencies_avg = [results[load]["avg_latency_ms"] for load in load_levels]
-    latencies_p95 = [results[load]["p95_latency_ms"] for load in load_levels]
-    latencies_p99 = [results[load]["p99_latency_ms"] for load in load_levels]
-    throughput = [results[load]["throughput_tps"] for load in load_levels]
-    cpu_usage = [results[load]["cpu_usage_pct"] for load in load_levels]
-    memory_usage = [results[load]["memory_gb"] for load in load_levels]
+    # Acesso colunar: um array por métrica, sem laços por carga
+    table = scalability_table(scalability_data)
+    load_levels = table["load"]
+    latencies_avg = table["avg_latency_ms"]
+    latencies_p95 = table["p95_latency_ms"]
+    latencies_p99 = table["p99_latency_ms"]
+    throughput = table["throughput_tps"]
+    cpu_usage = table["cpu_usage_pct"]
+    memory_usage = table["memory_gb"]
     
     # 3.1 Latência vs Carga
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure((12, 6))
     
     ax.plot(load_levels, latencies_avg, marker='o', linewidth=2, 
             label='Average Latency', color='#3498db')
@@ -286,12 +309,10 @@ def plot_scalability_analysis(scalability_data: Dict[str, Any], output_dir: Path
     ax.legend(fontsize=10)
     ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'scalability_latency.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'scalability_latency.png')
     
     # 3.2 Throughput vs Carga
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure((12, 6))
     
     ax.plot(load_levels, throughput, marker='o', linewidth=2, 
             color='#2ecc71', markersize=8)
@@ -302,17 +323,16 @@ def plot_scalability_analysis(scalability_data: Dict[str, Any], output_dir: Path
     ax.set_xscale('log')
     ax.grid(True, alpha=0.3)
     
-    # Adiciona valores
+    # Adiciona valores (textos simples com um único transform de offset
+    # compartilhado, em vez de um Annotation por ponto)
+    offset = mtransforms.offset_copy(ax.transData, fig=fig, x=0, y=10, units='points')
     for x, y in zip(load_levels, throughput):
-        ax.annotate(f'{y:.1f}', xy=(x, y), xytext=(0, 10),
-                   textcoords='offset points', ha='center', fontsize=9)
+        ax.text(x, y, f'{y:.1f}', transform=offset, ha='center', fontsize=9)
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'scalability_throughput.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'scalability_throughput.png')
     
     # 3.3 Uso de recursos (CPU e Memória)
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    fig, (ax1, ax2) = _new_figure((12, 10), 2, 1)
     
     # CPU Usage
     ax1.plot(load_levels, cpu_usage, marker='o', linewidth=2, 
@@ -338,9 +358,7 @@ def plot_scalability_analysis(scalability_data: Dict[str, Any], output_dir: Path
     ax2.legend(fontsize=10)
     ax2.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'scalability_resources.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'scalability_resources.png')
     
     print(f"  ✓ Scalability plots saved to {output_dir}")
 
@@ -352,57 +370,49 @@ def plot_scalability_analysis(scalability_data: Dict[str, Any], output_dir: Path
 def plot_sensitivity_analysis(sensitivity_data: Dict[str, Any], output_dir: Path):
     """
     Cria visualizações de análise de sensibilidade.
+    output_dir deve existir (criado por generate_all_advanced_plots).
     """
-    output_dir.mkdir(exist_ok=True, parents=True)
-    
     results = sensitivity_data["results"]
     sensitivity_scores = sensitivity_data["sensitivity_scores"]
     
     # 4.1 Heatmap de sensibilidade
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig, ax = _new_figure((12, 8))
     
-    params = list(sensitivity_scores.keys())
     metrics = ["TII", "SAE", "ITAL"]
     
-    # Matriz de sensibilidade
-    sensitivity_matrix = np.array([
-        [sensitivity_scores[p]["tii_sensitivity"] for p in params],
-        [sensitivity_scores[p]["sae_sensitivity"] for p in params],
-        [sensitivity_scores[p]["ital_sensitivity"] for p in params]
-    ])
+    # Matriz de sensibilidade (3 x P) e rótulos formatados de uma vez
+    params, matrix = sensitivity_matrix(sensitivity_scores)
+    annot = np.char.mod('%.4f', matrix)
     
-    sns.heatmap(sensitivity_matrix, annot=True, fmt='.4f', cmap='YlOrRd',
-               xticklabels=[p.replace('_', '\n') for p in params],
-               yticklabels=metrics, ax=ax, cbar_kws={'label': 'Sensitivity Score'},
-               linewidths=1, linecolor='black')
+    _heatmap(ax, matrix, annot, cmap='YlOrRd', linewidth=1,
+             xticklabels=[p.replace('_', '\n') for p in params],
+             yticklabels=metrics, cbar_label='Sensitivity Score')
     
     ax.set_title('Parameter Sensitivity Heatmap', fontsize=14, fontweight='bold')
     ax.set_xlabel('Parameters', fontsize=12, fontweight='bold')
     ax.set_ylabel('Metrics', fontsize=12, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'sensitivity_heatmap.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'sensitivity_heatmap.png')
     
     # 4.2 Gráficos de sensibilidade por parâmetro (grid)
     num_params = len(results)
     cols = 3
     rows = (num_params + cols - 1) // cols
     
-    fig, axes = plt.subplots(rows, cols, figsize=(15, 4*rows))
+    fig, axes = _new_figure((15, 4*rows), rows, cols)
     axes = axes.flatten() if num_params > 1 else [axes]
     
     for idx, (param_name, param_results) in enumerate(results.items()):
         ax = axes[idx]
         
         param_values = [r["param_value"] for r in param_results]
-        tii_values = [r["tii"] for r in param_results]
-        sae_values = [r["sae"] for r in param_results]
-        ital_values = [r["ital"] for r in param_results]
+        # colunas TII, SAE, ITAL: uma única chamada de plot por painel
+        metric_values = np.array([(r["tii"], r["sae"], r["ital"]) for r in param_results])
         
-        ax.plot(param_values, tii_values, marker='o', label='TII', linewidth=2)
-        ax.plot(param_values, sae_values, marker='s', label='SAE', linewidth=2)
-        ax.plot(param_values, ital_values, marker='^', label='ITAL', linewidth=2)
+        lines = ax.plot(param_values, metric_values, linewidth=2)
+        for line, marker, label in zip(lines, ['o', 's', '^'], ['TII', 'SAE', 'ITAL']):
+            line.set_marker(marker)
+            line.set_label(label)
         
         ax.set_xlabel(param_name.replace('_', ' ').title(), fontsize=10, fontweight='bold')
         ax.set_ylabel('Metric Value', fontsize=10, fontweight='bold')
@@ -415,12 +425,10 @@ def plot_sensitivity_analysis(sensitivity_data: Dict[str, Any], output_dir: Path
     for idx in range(num_params, len(axes)):
         fig.delaxes(axes[idx])
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'sensitivity_parameters.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'sensitivity_parameters.png')
     
     # 4.3 Ranking de sensibilidade agregada
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure((10, 6))
     
     params_sorted = sorted(sensitivity_scores.items(), 
                           key=lambda x: x[1]["aggregate_sensitivity"], 
@@ -439,15 +447,9 @@ def plot_sensitivity_analysis(sensitivity_data: Dict[str, Any], output_dir: Path
     ax.grid(True, alpha=0.3, axis='x')
     
     # Adiciona valores
-    for bar in bars:
-        width = bar.get_width()
-        ax.text(width, bar.get_y() + bar.get_height()/2.,
-                f'{width:.4f}',
-                ha='left', va='center', fontsize=10, fontweight='bold')
+    ax.bar_label(bars, fmt='{:.4f}', fontsize=10, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'sensitivity_ranking.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    _save(fig, output_dir / 'sensitivity_ranking.png')
     
     print(f"  ✓ Sensitivity plots saved to {output_dir}")
 
@@ -456,43 +458,61 @@ def plot_sensitivity_analysis(sensitivity_data: Dict[str, Any], output_dir: Path
 # RUNNER PARA TODAS AS VISUALIZAÇÕES
 # =========================================================================
 
+def _plot_group(job):
+    """Worker: gera um grupo de gráficos (cada grupo grava no próprio subdiretório)."""
+    plot_fn, data, output_dir = job
+    plot_fn(data, output_dir)
+
+
 def generate_all_advanced_plots(
     analyses_results: Dict[str, Any],
-    output_dir: Path
+    output_dir: Path,
+    max_workers: int = None
 ):
     """
     Gera todas as visualizações avançadas.
     
+    Os quatro grupos são independentes e renderizados em processos
+    separados (backend Agg, um subdiretório por grupo).
+    
     Args:
         analyses_results: Resultados das análises avançadas
         output_dir: Diretório de saída para os gráficos
+        max_workers: Número de processos (padrão: min(nº de grupos, os.cpu_count()));
+                     com 1, gera tudo no processo atual
     """
     print("\n" + "="*70)
     print("GENERATING ADVANCED PLOTS")
     print("="*70)
     
     output_dir = Path(output_dir)
-    output_dir.mkdir(exist_ok=True, parents=True)
-    
-    # 1. ROI Plots
-    if "roi" in analyses_results and analyses_results["roi"]:
-        print("\n[1/4] Generating ROI plots...")
-        plot_roi_analysis(analyses_results["roi"], output_dir / "roi")
-    
-    # 2. FP/FN Plots
-    if "fp_fn" in analyses_results and analyses_results["fp_fn"]:
-        print("\n[2/4] Generating FP/FN plots...")
-        plot_confusion_matrices(analyses_results["fp_fn"], output_dir / "fp_fn")
-    
-    # 3. Scalability Plots
-    if "scalability" in analyses_results and analyses_results["scalability"]:
-        print("\n[3/4] Generating Scalability plots...")
-        plot_scalability_analysis(analyses_results["scalability"], output_dir / "scalability")
-    
-    # 4. Sensitivity Plots
-    if "sensitivity" in analyses_results and analyses_results["sensitivity"]:
-        print("\n[4/4] Generating Sensitivity plots...")
-        plot_sensitivity_analysis(analyses_results["sensitivity"], output_dir / "sensitivity")
+    
+    groups = [
+        ("roi", "ROI", plot_roi_analysis),
+        ("fp_fn", "FP/FN", plot_confusion_matrices),
+        ("scalability", "Scalability", plot_scalability_analysis),
+        ("sensitivity", "Sensitivity", plot_sensitivity_analysis),
+    ]
+    
+    jobs = []
+    for i, (key, label, plot_fn) in enumerate(groups, 1):
+        if key in analyses_results and analyses_results[key]:
+            print(f"\n[{i}/4] Generating {label} plots...")
+            jobs.append((plot_fn, analyses_results[key], output_dir / key))
+    
+    # Diretórios criados aqui, uma vez, antes de despachar para os workers
+    for _, _, group_dir in jobs:
+        group_dir.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # list() propaga exceções dos workers
+            list(executor.map(_plot_group, jobs))
+    else:
+        for job in jobs:
+            _plot_group(job)
     
     print("\n" + "="*70)
     print(f"ALL PLOTS SAVED TO: {output_dir}")
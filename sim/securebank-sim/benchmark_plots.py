@@ -10,19 +10,78 @@ Gera:
 - Gráfico de trade-offs (TII vs SAE)
 """
 
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import matplotlib
+matplotlib.use('Agg')  # só exportamos PNG: sem backend interativo
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from pathlib import Path
-import pandas as pd
 from typing import Dict, List
 
-# Configuração visual
-sns.set_style("whitegrid")
-plt.rcParams['figure.dpi'] = 300
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
-plt.rcParams['font.family'] = 'serif'
+sns = None  # importado em _apply_style
+_style_applied = False
+
+
+def _apply_style():
+    """
+    Configuração visual, aplicada uma vez antes do primeiro gráfico.
+    seaborn é importado aqui: importar o módulo não paga o import dele
+    quando nenhum gráfico é gerado.
+    """
+    global _style_applied, sns
+    if _style_applied:
+        return
+    import seaborn as sns
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.dpi'] = 300
+    plt.rcParams['savefig.dpi'] = 300
+    plt.rcParams['font.size'] = 10
+    plt.rcParams['font.family'] = 'serif'
+    plt.rcParams['agg.path.chunksize'] = 10000
+    plt.rcParams['path.simplify_threshold'] = 1.0
+    _style_applied = True
+
+# zlib nível 1: savefig ~20% mais rápido, PNGs 1.3-2x maiores
+PNG_SAVE_KWARGS = {'pil_kwargs': {'compress_level': 1}}
+
+# Versão da renderização: incrementar ao mudar o código de qualquer gráfico
+# ou o estilo (_apply_style). Entra no hash de _input_digest junto com
+# PNG_SAVE_KWARGS e a versão do matplotlib, então PNGs gerados por uma
+# versão anterior são refeitos em vez de pulados.
+RENDER_VERSION = 1
+
+
+def _json_default(obj):
+    """Serialização para hash: arrays/escalares NumPy viram tipos Python."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@lru_cache(maxsize=32)
+def _radar_angles(num_dimensions: int) -> tuple:
+    """Ângulos do radar, com o primeiro repetido no fim para fechar o círculo."""
+    angles = np.linspace(0, 2 * np.pi, num_dimensions, endpoint=False).tolist()
+    return tuple(angles + angles[:1])
+
+
+def _run_plot(job):
+    """Worker: gera um gráfico num BenchmarkPlotter próprio do processo."""
+    output_dir, colors, framework_labels, method_name, data = job
+    plotter = BenchmarkPlotter(output_dir)
+    plotter.colors = colors
+    plotter.framework_labels = framework_labels
+    try:
+        getattr(plotter, method_name)(data)
+    finally:
+        plotter.close()
 
 
 class BenchmarkPlotter:
@@ -46,11 +105,65 @@ class BenchmarkPlotter:
             "nist_zta": "NIST ZTA",
             "securebank": "SecureBank™",
         }
+        
+        # Figure reaproveitada entre os gráficos (ver _new_figure)
+        self._fig = None
+    
+    def _new_figure(self, figsize, nrows: int = 1, ncols: int = 1, subplot_kw=None):
+        """
+        Limpa e redimensiona a Figure compartilhada e cria os eixos
+        (mesmo retorno de plt.subplots).
+        
+        O layout fica a cargo de um fig.tight_layout() explícito por
+        gráfico: com layout='constrained' o solver roda a cada draw, e o
+        savefig com bbox_inches='tight' desenha duas vezes (mais lento).
+        """
+        if self._fig is None:
+            _apply_style()
+            self._fig = plt.figure()
+        self._fig.clear()
+        self._fig.set_size_inches(*figsize)
+        return self._fig, self._fig.subplots(nrows, ncols, subplot_kw=subplot_kw)
+    
+    def close(self):
+        """Libera a Figure compartilhada."""
+        if self._fig is not None:
+            plt.close(self._fig)
+            self._fig = None
+    
+    # ------------------------------------------------------------------
+    # Cache de saída: cada gráfico grava ao lado um ".<arquivo>.hash" com o
+    # sha256 dos dados de entrada e da renderização (RENDER_VERSION, opções
+    # de gravação, versão do matplotlib); se o PNG existe e o hash confere,
+    # o gráfico é pulado sem tocar no matplotlib.
+    # ------------------------------------------------------------------
+    def _input_digest(self, data) -> str:
+        render = [RENDER_VERSION, matplotlib.__version__, PNG_SAVE_KWARGS]
+        payload = json.dumps([render, data, self.colors, self.framework_labels],
+                             sort_keys=True, default=_json_default)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _hash_path(self, filename: str) -> Path:
+        return self.output_dir / f".{filename}.hash"
+    
+    def _is_up_to_date(self, filename: str, digest: str) -> bool:
+        hash_path = self._hash_path(filename)
+        if not (self.output_dir / filename).exists() or not hash_path.exists():
+            return False
+        return hash_path.read_text().strip() == digest
+    
+    def _mark_saved(self, filename: str, digest: str):
+        self._hash_path(filename).write_text(digest)
     
     def plot_radar_chart(self, qualitative_scores: Dict, filename="radar_comparison.png"):
         """
         Gráfico radar (spider chart) com 6 dimensões qualitativas.
         """
+        digest = self._input_digest(qualitative_scores)
+        if self._is_up_to_date(filename, digest):
+            print(f"Radar chart up to date: {filename}")
+            return
+        
         dimensions = [
             "Financial Context\nAwareness",
             "Adaptive Identity\nScoring",
@@ -78,10 +191,9 @@ class BenchmarkPlotter:
         }
         
         # Setup radar chart
-        angles = np.linspace(0, 2 * np.pi, len(dimensions), endpoint=False).tolist()
-        angles += angles[:1]  # fecha o círculo
+        angles = list(_radar_angles(len(dimensions)))  # fecha o círculo
         
-        fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
+        fig, ax = self._new_figure((10, 10), subplot_kw=dict(projection='polar'))
         
         # Plota cada framework
         for framework in frameworks:
@@ -99,14 +211,14 @@ class BenchmarkPlotter:
         ax.set_yticklabels(['20', '40', '60', '80', '100'], size=8)
         ax.grid(True, linestyle='--', alpha=0.7)
         
-        plt.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=11)
-        plt.title("Framework Comparison: Qualitative Dimensions", 
-                 size=14, weight='bold', pad=20)
+        ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=11)
+        ax.set_title("Framework Comparison: Qualitative Dimensions", 
+                    size=14, weight='bold', pad=20)
         
-        plt.tight_layout()
-        plt.savefig(self.output_dir / filename, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(self.output_dir / filename, bbox_inches='tight', **PNG_SAVE_KWARGS)
         
+        self._mark_saved(filename, digest)
         print(f"Saved radar chart: {filename}")
     
     def plot_metrics_comparison(self, quantitative_metrics: Dict, 
@@ -114,10 +226,15 @@ class BenchmarkPlotter:
         """
         Gráficos de barras agrupadas para métricas quantitativas.
         """
+        digest = self._input_digest(quantitative_metrics)
+        if self._is_up_to_date(filename, digest):
+            print(f"Metrics comparison up to date: {filename}")
+            return
+        
         frameworks = ["baseline", "nist_zta", "securebank"]
         metrics = ["TII", "SAE", "ITAL"]
         
-        fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+        fig, axes = self._new_figure((15, 5), 1, 3)
         
         for idx, metric in enumerate(metrics):
             ax = axes[idx]
@@ -140,10 +257,10 @@ class BenchmarkPlotter:
             ax.grid(axis='y', alpha=0.3, linestyle='--')
             ax.set_title(f"{metric} Comparison", fontsize=12, weight='bold')
         
-        plt.tight_layout()
-        plt.savefig(self.output_dir / filename, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(self.output_dir / filename, bbox_inches='tight', **PNG_SAVE_KWARGS)
         
+        self._mark_saved(filename, digest)
         print(f"Saved metrics comparison: {filename}")
     
     def plot_mitre_coverage_heatmap(self, mitre_coverage: Dict, 
@@ -151,60 +268,62 @@ class BenchmarkPlotter:
         """
         Matriz de cobertura MITRE ATT&CK (heatmap).
         """
+        digest = self._input_digest(mitre_coverage["matrix"])
+        if self._is_up_to_date(filename, digest):
+            print(f"MITRE coverage heatmap up to date: {filename}")
+            return
+        
         matrix = mitre_coverage["matrix"]
         
         # Prepara dados para heatmap
         techniques = sorted(matrix.keys())
         frameworks = ["baseline", "nist_zta", "securebank"]
         
-        data = []
-        labels = []
-        
-        for tech_id in techniques:
-            tech_data = matrix[tech_id]
-            tech_name = tech_data["technique_name"]
-            labels.append(f"{tech_id}\n{tech_name}")
-            
-            row = [tech_data[f] for f in frameworks]
-            data.append(row)
+        labels = [f"{tech_id}\n{matrix[tech_id]['technique_name']}" for tech_id in techniques]
         
-        data = np.array(data)
+        # Matriz (técnicas x frameworks) preenchida numa única alocação
+        data = np.fromiter(
+            (matrix[tech_id][f] for tech_id in techniques for f in frameworks),
+            dtype=float, count=len(techniques) * len(frameworks),
+        ).reshape(len(techniques), len(frameworks))
         
         # Cria heatmap
-        fig, ax = plt.subplots(figsize=(10, 12))
-        
-        im = ax.imshow(data, cmap='RdYlGn', aspect='auto', vmin=0, vmax=100)
-        
-        # Configura eixos
-        ax.set_xticks(np.arange(len(frameworks)))
-        ax.set_yticks(np.arange(len(techniques)))
-        ax.set_xticklabels([self.framework_labels[f] for f in frameworks], fontsize=11)
-        ax.set_yticklabels(labels, fontsize=8)
-        
-        # Adiciona valores nas células
-        for i in range(len(techniques)):
-            for j in range(len(frameworks)):
-                text = ax.text(j, i, f'{data[i, j]:.0f}%',
-                             ha="center", va="center", color="black", 
-                             fontsize=9, weight='bold')
+        fig, ax = self._new_figure((10, 12))
+        
+        # sns.heatmap desenha as células como pcolormesh (vetorial), em vez
+        # de reamostrar uma imagem do tamanho da figura a 300 dpi como imshow
+        sns.heatmap(
+            data, ax=ax, cmap='RdYlGn', vmin=0, vmax=100,
+            annot=np.char.add(np.char.mod('%.0f', data), '%'), fmt='',
+            annot_kws={'color': 'black', 'fontsize': 9, 'weight': 'bold'},
+            xticklabels=[self.framework_labels[f] for f in frameworks],
+            yticklabels=labels,
+        )
+        ax.tick_params(axis='x', labelsize=11, labelrotation=0)
+        ax.tick_params(axis='y', labelsize=8, labelrotation=0)
         
         # Colorbar
-        cbar = plt.colorbar(im, ax=ax)
+        cbar = ax.collections[0].colorbar
         cbar.set_label('Detection Rate (%)', rotation=270, labelpad=20, fontsize=11)
         
         ax.set_title("MITRE ATT&CK Coverage Matrix", fontsize=14, weight='bold', pad=15)
         
-        plt.tight_layout()
-        plt.savefig(self.output_dir / filename, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(self.output_dir / filename, bbox_inches='tight', **PNG_SAVE_KWARGS)
         
+        self._mark_saved(filename, digest)
         print(f"Saved MITRE coverage heatmap: {filename}")
     
     def plot_tradeoffs(self, tradeoffs: Dict, filename="tradeoffs_analysis.png"):
         """
         Gráfico de trade-offs (TII vs SAE, effectiveness vs overhead).
         """
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        digest = self._input_digest(tradeoffs)
+        if self._is_up_to_date(filename, digest):
+            print(f"Trade-offs analysis up to date: {filename}")
+            return
+        
+        fig, axes = self._new_figure((14, 6), 1, 2)
         
         # TII vs SAE
         ax1 = axes[0]
@@ -245,10 +364,10 @@ class BenchmarkPlotter:
         ax2.grid(True, alpha=0.3, linestyle='--')
         ax2.set_ylim(0, 1.05)
         
-        plt.tight_layout()
-        plt.savefig(self.output_dir / filename, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(self.output_dir / filename, bbox_inches='tight', **PNG_SAVE_KWARGS)
         
+        self._mark_saved(filename, digest)
         print(f"Saved trade-offs analysis: {filename}")
     
     def generate_comparison_table_latex(self, comparison_table: Dict, 
@@ -303,27 +422,44 @@ class BenchmarkPlotter:
         
         print(f"Saved LaTeX table: {filename}")
     
-    def generate_all_plots(self, comparison_data: Dict, mitre_coverage: Dict):
+    def generate_all_plots(self, comparison_data: Dict, mitre_coverage: Dict,
+                           max_workers: int = None):
         """
         Gera todas as visualizações de uma vez.
         
+        Os quatro gráficos são independentes (arquivos e figuras próprios) e
+        são renderizados em processos separados.
+        
         Args:
             comparison_data: resultado de compare_frameworks()
             mitre_coverage: resultado de analyze_mitre_coverage()
+            max_workers: Número de processos (padrão: min(nº de gráficos, os.cpu_count()));
+                         com 1, gera tudo no processo atual
         """
         print("\nGenerating benchmark visualizations...")
         
-        # 1. Radar chart
-        self.plot_radar_chart(comparison_data["qualitative_scores"])
-        
-        # 2. Metrics comparison
-        self.plot_metrics_comparison(comparison_data["quantitative_metrics"])
-        
-        # 3. MITRE coverage heatmap
-        self.plot_mitre_coverage_heatmap(mitre_coverage)
+        plots = [
+            # 1. Radar chart
+            ("plot_radar_chart", comparison_data["qualitative_scores"]),
+            # 2. Metrics comparison
+            ("plot_metrics_comparison", comparison_data["quantitative_metrics"]),
+            # 3. MITRE coverage heatmap
+            ("plot_mitre_coverage_heatmap", mitre_coverage),
+            # 4. Trade-offs
+            ("plot_tradeoffs", comparison_data["tradeoffs"]),
+        ]
         
-        # 4. Trade-offs
-        self.plot_tradeoffs(comparison_data["tradeoffs"])
+        max_workers = max_workers or min(len(plots), os.cpu_count() or 1)
+        if max_workers > 1:
+            jobs = [(self.output_dir, self.colors, self.framework_labels, name, data)
+                    for name, data in plots]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                # list() propaga exceções dos workers
+                list(executor.map(_run_plot, jobs))
+        else:
+            for name, data in plots:
+                getattr(self, name)(data)
+            self.close()
         
         # 5. LaTeX table
         self.generate_comparison_table_latex(comparison_data["comparison_table"])
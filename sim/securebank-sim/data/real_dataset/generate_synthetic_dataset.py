@@ -16,222 +16,312 @@ Este dataset sintético mantém características estatísticas realistas:
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
-import random
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pacsv  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pyarrow é opcional
+    pa = None
 
 # Seed para reprodutibilidade
-np.random.seed(42)
-random.seed(42)
+SEED = 42
+
+# Categorias e distribuições de probabilidade (já normalizadas), fixas
+# entre chamadas de generate_realistic_fraud_dataset.
+
+# Tipos de usuários
+USER_TYPE_NAMES = ['retail_customer', 'business_customer', 'employee', 'corporate']
+_USER_TYPE_PROBS = np.array([0.70, 0.15, 0.10, 0.05])
+
+# Dispositivos por usuário (1 a 4)
+_NUM_DEV_PROBS = np.array([0.5, 0.3, 0.15, 0.05])
+
+# Tipos de serviços bancários
+SERVICES = [
+    'payments', 'settlement', 'risk_analytics', 
+    'aml', 'customer_identity', 'wire_transfer',
+    'credit_card', 'debit_card', 'mobile_payment'
+]
+_SERVICE_PROBS = np.array([0.25, 0.10, 0.05, 0.08, 0.07, 0.12, 0.18, 0.10, 0.05])
+
+# Canais de acesso
+CHANNELS = ['web', 'mobile', 'api', 'atm', 'pos']
+_CHANNEL_PROBS_NORMAL = np.array([0.30, 0.35, 0.15, 0.10, 0.10])
+# Fraudes têm maior probabilidade de API abuse
+_CHANNEL_PROBS_FRAUD = np.array([0.15, 0.20, 0.40, 0.15, 0.10])
+
+# Geolocalizações (países e cidades)
+GEO_LOCATIONS = [
+    'US-NY', 'US-CA', 'US-FL', 'US-TX', 'US-IL',
+    'BR-SP', 'BR-RJ', 'BR-MG',
+    'GB-LND', 'DE-BER', 'FR-PAR',
+    'RU-MOS', 'CN-BEI', 'NG-LGS', 'IN-MUM'
+]
+# País de cada geolocalização, como código em COUNTRIES
+COUNTRIES = list(dict.fromkeys(g.split('-')[0] for g in GEO_LOCATIONS))
+_GEO_COUNTRY_CODES = np.array([COUNTRIES.index(g.split('-')[0]) for g in GEO_LOCATIONS], dtype=np.int8)
+# Os 5 primeiros (US) são domésticos
+_NUM_DOMESTIC = 5
+
+# Probabilidades de localização (locais comuns vs. suspeitos)
+_GEO_PROBS_NORMAL = np.array([
+    0.20, 0.15, 0.12, 0.10, 0.08,  # US
+    0.10, 0.08, 0.05,  # BR
+    0.04, 0.03, 0.03,  # Europa
+    0.01, 0.005, 0.005, 0.01  # Locais suspeitos
+])
+_GEO_PROBS_NORMAL /= _GEO_PROBS_NORMAL.sum()
+
+_GEO_PROBS_FRAUD = np.array([
+    0.05, 0.05, 0.05, 0.03, 0.02,  # US (reduzido)
+    0.03, 0.02, 0.02,  # BR (reduzido)
+    0.05, 0.05, 0.03,  # Europa
+    0.25, 0.20, 0.15, 0.05  # Locais suspeitos (aumentado)
+])
+_GEO_PROBS_FRAUD /= _GEO_PROBS_FRAUD.sum()
+
+# Mais transações durante horário comercial
+_HOUR_PROBS = np.array([
+    0.01, 0.01, 0.01, 0.01, 0.01, 0.02,  # 0-5h (madrugada)
+    0.03, 0.04, 0.05, 0.06, 0.07, 0.08,  # 6-11h (manhã)
+    0.08, 0.08, 0.08, 0.07, 0.06, 0.05,  # 12-17h (tarde)
+    0.05, 0.04, 0.03, 0.02, 0.02, 0.01   # 18-23h (noite)
+])
+_HOUR_PROBS /= _HOUR_PROBS.sum()  # Normaliza para somar 1.0
+
+# Tipos de fraude (baseado nos cenários do SecureBank)
+FRAUD_SCENARIOS = [
+    'credential_compromise',
+    'insider_lateral_movement',
+    'api_abuse',
+    'money_laundering',
+    'session_hijacking',
+    'card_theft',
+    'synthetic_identity'
+]
+
+DEVICE_TYPES = ['mobile', 'desktop', 'tablet']
+_DEVICE_TYPE_PROBS = np.array([0.5, 0.4, 0.1])
+OPERATING_SYSTEMS = ['iOS', 'Android', 'Windows', 'MacOS', 'Linux']
+_OS_PROBS = np.array([0.25, 0.30, 0.25, 0.15, 0.05])
+BROWSERS = ['Chrome', 'Safari', 'Firefox', 'Edge', 'Other']
+_BROWSER_PROBS = np.array([0.45, 0.25, 0.15, 0.10, 0.05])
 
-def generate_realistic_fraud_dataset(num_transactions=10000, fraud_rate=0.035):
+# Colunas de ID: inteiras (int32) no DataFrame, formatadas como texto
+# (prefixo + zeros à esquerda) só na hora de salvar; o Timestamp fica como
+# datetime64[us] e vira ISO 8601 também só na exportação
+ID_FORMATS = {
+    'TransactionID': ('T', 8),
+    'UserID': ('U', 6),
+    'CardID': ('C', 6),
+    'DeviceID': ('D', 6),
+}
+
+
+def format_for_export(df):
+    """
+    Cópia de df com as colunas de ID no formato textual (ex.: 'U000042') e
+    o Timestamp em ISO 8601 (ex.: '2024-01-01T02:45:17.667734').
+    """
+    out = df.copy(deep=False)
+    for col, (prefix, width) in ID_FORMATS.items():
+        values = out[col].to_numpy()
+        out[col] = np.char.add(prefix, np.char.zfill(values.astype(str), width))
+    out['Timestamp'] = np.datetime_as_string(out['Timestamp'].to_numpy(), unit='us')
+    return out
+
+
+def _category_counts(values):
+    """
+    Contagem por categoria de uma coluna categórica (np.bincount sobre os
+    códigos), em ordem decrescente como value_counts; NaN é ignorado.
+    """
+    codes = values.cat.codes.to_numpy()
+    categories = values.cat.categories
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    order = np.argsort(-counts, kind='stable')
+    return {categories[i]: int(counts[i]) for i in order}
+
+
+def generate_realistic_fraud_dataset(num_transactions=10000, fraud_rate=0.035, rng=None):
     """
     Gera dataset sintético realista de transações bancárias.
     
     Args:
         num_transactions: Número total de transações
         fraud_rate: Taxa de fraude (default: 3.5% similar a datasets reais)
+        rng: rng.Generator ou seed (default: SEED)
     
     Returns:
         DataFrame com transações
     """
+    rng = np.random.default_rng(SEED if rng is None else rng)
     
     # Número de usuários e dispositivos
     num_users = int(num_transactions * 0.1)  # 10% do total de transações
     num_devices = int(num_users * 1.6)  # Média de 1.6 dispositivos por usuário
     num_cards = int(num_users * 1.3)  # Média de 1.3 cartões por usuário
-    
-    # IDs de usuários, cartões e dispositivos
-    user_ids = np.arange(num_users)
-    card_ids = np.arange(num_cards)
-    device_ids = np.arange(num_devices)
-    
-    # Tipos de usuários e seus perfis de risco
-    user_types = np.random.choice(
-        ['retail_customer', 'business_customer', 'employee', 'corporate'],
+    # IDs de usuários, cartões e dispositivos: 0..num_users-1 etc.
+    if num_users < 1:
+        raise ValueError(
+            f"num_transactions must be at least 10 (got {num_transactions}): "
+            "the dataset needs at least one user"
+        )
+    
+    # Tipos de usuários e seus perfis de risco (código por usuário)
+    user_types = rng.choice(
+        len(USER_TYPE_NAMES),
         size=num_users,
-        p=[0.70, 0.15, 0.10, 0.05]
-    )
+        p=_USER_TYPE_PROBS
+    ).astype(np.int8)
     
     # Base risk por tipo de usuário
     user_base_risk = {
-        'retail_customer': np.random.uniform(0.1, 0.4, num_users),
-        'business_customer': np.random.uniform(0.05, 0.3, num_users),
-        'employee': np.random.uniform(0.03, 0.25, num_users),
-        'corporate': np.random.uniform(0.02, 0.20, num_users),
+        'retail_customer': rng.uniform(0.1, 0.4, num_users),
+        'business_customer': rng.uniform(0.05, 0.3, num_users),
+        'employee': rng.uniform(0.03, 0.25, num_users),
+        'corporate': rng.uniform(0.02, 0.20, num_users),
     }
     
     # Mapeia usuários para dispositivos
-    user_to_devices = {}
-    for uid in user_ids:
-        # Cada usuário tem entre 1 e 4 dispositivos
-        num_dev = np.random.choice([1, 2, 3, 4], p=[0.5, 0.3, 0.15, 0.05])
-        user_to_devices[uid] = np.random.choice(device_ids, size=num_dev, replace=False).tolist()
-    
-    # Tipos de serviços bancários
-    services = [
-        'payments', 'settlement', 'risk_analytics', 
-        'aml', 'customer_identity', 'wire_transfer',
-        'credit_card', 'debit_card', 'mobile_payment'
-    ]
-    
-    # Probabilidades de cada serviço
-    service_probs = [0.25, 0.10, 0.05, 0.08, 0.07, 0.12, 0.18, 0.10, 0.05]
-    
-    # Canais de acesso
-    channels = ['web', 'mobile', 'api', 'atm', 'pos']
-    channel_probs = [0.30, 0.35, 0.15, 0.10, 0.10]
-    
-    # Geolocalizações (países e cidades)
-    geo_locations = [
-        'US-NY', 'US-CA', 'US-FL', 'US-TX', 'US-IL',
-        'BR-SP', 'BR-RJ', 'BR-MG',
-        'GB-LND', 'DE-BER', 'FR-PAR',
-        'RU-MOS', 'CN-BEI', 'NG-LGS', 'IN-MUM'
-    ]
-    
-    # Probabilidades de localização (locais comuns vs. suspeitos)
-    geo_probs_normal = np.array([
-        0.20, 0.15, 0.12, 0.10, 0.08,  # US
-        0.10, 0.08, 0.05,  # BR
-        0.04, 0.03, 0.03,  # Europa
-        0.01, 0.005, 0.005, 0.01  # Locais suspeitos
-    ])
-    geo_probs_normal = geo_probs_normal / geo_probs_normal.sum()
-    
-    geo_probs_fraud = np.array([
-        0.05, 0.05, 0.05, 0.03, 0.02,  # US (reduzido)
-        0.03, 0.02, 0.02,  # BR (reduzido)
-        0.05, 0.05, 0.03,  # Europa
-        0.25, 0.20, 0.15, 0.05  # Locais suspeitos (aumentado)
-    ])
-    geo_probs_fraud = geo_probs_fraud / geo_probs_fraud.sum()
+    # Cada usuário tem entre 1 e 4 dispositivos distintos (no máximo
+    # num_devices, para datasets pequenos): sorteia 4 por usuário e refaz só
+    # as linhas com repetição entre as num_dev primeiras colunas, as únicas
+    # usadas, da tabela (num_users, 4). Com no máximo 4 por usuário a tabela
+    # retangular dispensa offsets (CSR): o dispositivo de cada transação sai
+    # de um único gather user_devices[user_id, coluna]
+    devices_per_user = np.minimum(
+        rng.choice([1, 2, 3, 4], size=num_users, p=_NUM_DEV_PROBS), num_devices
+    )
+    user_devices = rng.integers(num_devices, size=(num_users, 4))
+    rows = np.arange(num_users)
+    while True:
+        sub = user_devices[rows]
+        k = devices_per_user[rows]
+        dup = np.zeros(len(rows), dtype=bool)
+        for j in range(1, 4):
+            used = k > j
+            for i in range(j):
+                dup |= used & (sub[:, i] == sub[:, j])
+        rows = rows[dup]
+        if rows.size == 0:
+            break
+        user_devices[rows] = rng.integers(num_devices, size=(rows.size, 4))
+    user_devices = user_devices.astype(np.int32)
     
     # Timestamp inicial
-    start_date = datetime(2024, 1, 1, 0, 0, 0)
-    
-    # Lista para armazenar transações
-    transactions = []
-    
-    # Número de transações fraudulentas
-    num_fraud = int(num_transactions * fraud_rate)
-    fraud_indices = set(np.random.choice(num_transactions, size=num_fraud, replace=False))
-    
-    # Tipos de fraude (baseado nos cenários do SecureBank)
-    fraud_scenarios = [
-        'credential_compromise',
-        'insider_lateral_movement',
-        'api_abuse',
-        'money_laundering',
-        'session_hijacking',
-        'card_theft',
-        'synthetic_identity'
-    ]
-    
-    for i in range(num_transactions):
-        is_fraud = i in fraud_indices
-        
-        # Seleciona usuário
-        user_id = np.random.choice(user_ids)
-        user_type = user_types[user_id]
-        
-        # Seleciona dispositivo do usuário
-        device_id = np.random.choice(user_to_devices[user_id])
-        
-        # Seleciona cartão
-        card_id = np.random.choice(card_ids)
-        
-        # Timestamp (distribuição realista ao longo do tempo)
-        # Mais transações durante horário comercial
-        hours_offset = np.random.exponential(scale=2.0) * 24 * 30  # ~2 meses
-        hour_probs = np.array([
-            0.01, 0.01, 0.01, 0.01, 0.01, 0.02,  # 0-5h (madrugada)
-            0.03, 0.04, 0.05, 0.06, 0.07, 0.08,  # 6-11h (manhã)
-            0.08, 0.08, 0.08, 0.07, 0.06, 0.05,  # 12-17h (tarde)
-            0.05, 0.04, 0.03, 0.02, 0.02, 0.01   # 18-23h (noite)
-        ])
-        hour_probs = hour_probs / hour_probs.sum()  # Normaliza para somar 1.0
-        hour_of_day = np.random.choice(24, p=hour_probs)
-        timestamp = start_date + timedelta(hours=hours_offset + hour_of_day)
-        
-        # Valor da transação (distribuição log-normal)
-        if not is_fraud:
-            # Transações normais: valores menores
-            amount = np.random.lognormal(mean=4.5, sigma=1.2)
-            amount = max(5.0, min(amount, 50000.0))  # entre $5 e $50k
-        else:
-            # Transações fraudulentas: valores maiores ou padrões específicos
-            fraud_type = np.random.choice(['high_value', 'structured', 'normal'])
-            if fraud_type == 'high_value':
-                amount = np.random.lognormal(mean=8.0, sigma=0.8)
-                amount = max(5000.0, min(amount, 500000.0))
-            elif fraud_type == 'structured':
-                # Estruturação (valores logo abaixo de thresholds)
-                amount = np.random.uniform(9000, 9999)
-            else:
-                amount = np.random.lognormal(mean=5.5, sigma=1.0)
-                amount = max(100.0, min(amount, 20000.0))
-        
-        # Serviço
-        service = np.random.choice(services, p=service_probs)
-        
-        # Canal
-        if not is_fraud:
-            channel = np.random.choice(channels, p=channel_probs)
-        else:
-            # Fraudes têm maior probabilidade de API abuse
-            channel = np.random.choice(channels, p=[0.15, 0.20, 0.40, 0.15, 0.10])
+    start_date = np.datetime64(datetime(2024, 1, 1, 0, 0, 0), 'us')
+    
+    # Todas as colunas são sorteadas de uma vez (um array tipado de tamanho N
+    # por atributo, SoA); ramos fraude/legítima viram máscaras booleanas.
+    # Colunas de texto com poucos valores são sorteadas como códigos e viram
+    # pd.Categorical (1 byte por linha em vez de um str Python).
+    N = num_transactions
+    
+    # Transações fraudulentas
+    num_fraud = int(N * fraud_rate)
+    is_fraud = np.zeros(N, dtype=bool)
+    is_fraud[rng.choice(N, size=num_fraud, replace=False)] = True
+    legit = ~is_fraud
+    num_legit = N - num_fraud
+    
+    def by_class(draw_legit, draw_fraud):
+        """Preenche um array de tamanho N: draw_legit(n) nas legítimas, draw_fraud(n) nas fraudes."""
+        legit_values = draw_legit(num_legit)
+        out = np.empty(N, dtype=legit_values.dtype)
+        out[legit] = legit_values
+        out[is_fraud] = draw_fraud(num_fraud)
+        return out
+    
+    # Usuário, dispositivo do usuário e cartão
+    user_id = rng.integers(num_users, size=N, dtype=np.int32)
+    device_id = user_devices[user_id, (rng.random(N) * devices_per_user[user_id]).astype(np.int64)]
+    card_id = rng.integers(num_cards, size=N, dtype=np.int32)
+    
+    # Timestamp (distribuição realista ao longo do tempo)
+    hours_offset = rng.exponential(scale=2.0, size=N) * 24 * 30  # ~2 meses
+    hour_of_day = rng.choice(24, size=N, p=_HOUR_PROBS).astype(np.int8)
+    timestamp = start_date + np.round((hours_offset + hour_of_day) * 3.6e9).astype('timedelta64[us]')
+    # 1970-01-01 foi quinta-feira (weekday 3)
+    day_of_week = ((timestamp.astype('datetime64[D]').astype(np.int64) + 3) % 7).astype(np.int8)
+    
+    # Valor da transação (distribuição log-normal)
+    def fraud_amounts(n):
+        # Transações fraudulentas: valores maiores ou padrões específicos
+        # 0 = high_value, 1 = structured, 2 = normal
+        fraud_type = rng.choice(3, size=n)
+        high_value = np.clip(rng.lognormal(mean=8.0, sigma=0.8, size=n), 5000.0, 500000.0)
+        # Estruturação (valores logo abaixo de thresholds)
+        structured = rng.uniform(9000, 9999, size=n)
+        normal = np.clip(rng.lognormal(mean=5.5, sigma=1.0, size=n), 100.0, 20000.0)
+        return np.select([fraud_type == 0, fraud_type == 1],
+                         [high_value, structured], normal)
+    
+    # Transações normais: valores menores, entre $5 e $50k
+    amount = by_class(
+        lambda n: np.clip(rng.lognormal(mean=4.5, sigma=1.2, size=n), 5.0, 50000.0),
+        fraud_amounts,
+    )
+    
+    def codes(n, labels, p=None):
+        """n códigos (int8) sorteados entre os índices de labels."""
+        return rng.choice(len(labels), size=n, p=p).astype(np.int8)
+    
+    # Serviço, canal e geolocalização
+    service = codes(N, SERVICES, _SERVICE_PROBS)
+    channel = by_class(
+        lambda n: codes(n, CHANNELS, _CHANNEL_PROBS_NORMAL),
+        lambda n: codes(n, CHANNELS, _CHANNEL_PROBS_FRAUD),
+    )
+    geo_idx = by_class(
+        lambda n: codes(n, GEO_LOCATIONS, _GEO_PROBS_NORMAL),
+        lambda n: codes(n, GEO_LOCATIONS, _GEO_PROBS_FRAUD),
+    )
+    
+    # Cenário de fraude (-1 = sem cenário, vira NaN no Categorical)
+    fraud_scenario = np.full(N, -1, dtype=np.int8)
+    fraud_scenario[is_fraud] = codes(num_fraud, FRAUD_SCENARIOS)
+    
+    def categorical(values, labels):
+        return pd.Categorical.from_codes(values, categories=labels)
+    
+    # Atributos adicionais (característicos de datasets reais)
+    df = pd.DataFrame({
+        'TransactionID': np.arange(N, dtype=np.int32),
+        'Timestamp': timestamp,
+        'Amount': np.round(amount, 2),
+        'UserID': user_id,
+        'UserType': categorical(user_types[user_id], USER_TYPE_NAMES),
+        'CardID': card_id,
+        'DeviceID': device_id,
+        'Service': categorical(service, SERVICES),
+        'Channel': categorical(channel, CHANNELS),
+        'GeoLocation': categorical(geo_idx, GEO_LOCATIONS),
+        'HourOfDay': hour_of_day,
+        'DayOfWeek': day_of_week,
+        'IsFraud': is_fraud.astype(np.int8),
+        'FraudScenario': categorical(fraud_scenario, FRAUD_SCENARIOS),
         
-        # Geolocalização
-        if not is_fraud:
-            geo = np.random.choice(geo_locations, p=geo_probs_normal)
-        else:
-            geo = np.random.choice(geo_locations, p=geo_probs_fraud)
+        # Atributos adicionais realistas
+        'DeviceType': categorical(codes(N, DEVICE_TYPES, _DEVICE_TYPE_PROBS), DEVICE_TYPES),
+        'OS': categorical(codes(N, OPERATING_SYSTEMS, _OS_PROBS), OPERATING_SYSTEMS),
+        'Browser': categorical(codes(N, BROWSERS, _BROWSER_PROBS), BROWSERS),
+        'IPCountry': categorical(_GEO_COUNTRY_CODES[geo_idx], COUNTRIES),
         
-        # Cenário de fraude
-        fraud_scenario = None
-        if is_fraud:
-            fraud_scenario = np.random.choice(fraud_scenarios)
+        # Velocidade de transação (transações nas últimas 24h)
+        'TransactionVelocity24h': by_class(lambda n: rng.poisson(3, n), lambda n: rng.poisson(15, n)).astype(np.int32),
         
-        # Atributos adicionais (característicos de datasets reais)
-        transaction = {
-            'TransactionID': f'T{i:08d}',
-            'Timestamp': timestamp.isoformat(),
-            'Amount': round(amount, 2),
-            'UserID': f'U{user_id:06d}',
-            'UserType': user_type,
-            'CardID': f'C{card_id:06d}',
-            'DeviceID': f'D{device_id:06d}',
-            'Service': service,
-            'Channel': channel,
-            'GeoLocation': geo,
-            'HourOfDay': hour_of_day,
-            'DayOfWeek': timestamp.weekday(),
-            'IsFraud': int(is_fraud),
-            'FraudScenario': fraud_scenario if is_fraud else None,
-            
-            # Atributos adicionais realistas
-            'DeviceType': np.random.choice(['mobile', 'desktop', 'tablet'], p=[0.5, 0.4, 0.1]),
-            'OS': np.random.choice(['iOS', 'Android', 'Windows', 'MacOS', 'Linux'], p=[0.25, 0.30, 0.25, 0.15, 0.05]),
-            'Browser': np.random.choice(['Chrome', 'Safari', 'Firefox', 'Edge', 'Other'], p=[0.45, 0.25, 0.15, 0.10, 0.05]),
-            'IPCountry': geo.split('-')[0],
-            
-            # Velocidade de transação (transações nas últimas 24h)
-            'TransactionVelocity24h': np.random.poisson(3) if not is_fraud else np.random.poisson(15),
-            
-            # Distância da última transação (em km)
-            'DistanceFromLastTx': np.random.exponential(50) if not is_fraud else np.random.exponential(2000),
-            
-            # Indicadores de risco
-            'IsNewDevice': int(np.random.random() < 0.1) if not is_fraud else int(np.random.random() < 0.6),
-            'IsInternational': int(geo not in ['US-NY', 'US-CA', 'US-FL', 'US-TX', 'US-IL']),
-            'IsHighRiskMerchant': int(is_fraud and np.random.random() < 0.4),
-        }
+        # Distância da última transação (em km)
+        'DistanceFromLastTx': by_class(lambda n: rng.exponential(50, n), lambda n: rng.exponential(2000, n)),
         
-        transactions.append(transaction)
-    
-    # Converte para DataFrame
-    df = pd.DataFrame(transactions)
+        # Indicadores de risco
+        'IsNewDevice': (rng.random(N) < np.where(is_fraud, 0.6, 0.1)).astype(np.int8),
+        'IsInternational': (geo_idx >= _NUM_DOMESTIC).astype(np.int8),
+        'IsHighRiskMerchant': (is_fraud & (rng.random(N) < 0.4)).astype(np.int8),
+    }, copy=False)
     
     # Ordena por timestamp
     df = df.sort_values('Timestamp').reset_index(drop=True)
@@ -239,41 +329,64 @@ def generate_realistic_fraud_dataset(num_transactions=10000, fraud_rate=0.035):
     return df
 
 
-def save_dataset(df, output_dir='/home/ubuntu/securebank_analysis/securebank-sim/data/real_dataset'):
-    """Salva o dataset em múltiplos formatos."""
+def save_dataset(df, output_dir='/home/ubuntu/securebank_analysis/securebank-sim/data/real_dataset',
+                 save_json=False):
+    """
+    Salva o dataset em múltiplos formatos (colunas formatadas via format_for_export).
     
-    # CSV
+    CSV (e Parquet, com pyarrow) sempre; com save_json=True também
+    fraud_transactions.jsonl (JSON Lines, um registro por linha).
+    """
+    
+    out = format_for_export(df)
+    
+    # CSV (com pyarrow a escrita é colunar; sem ele, to_csv do pandas)
     csv_path = f'{output_dir}/fraud_transactions.csv'
-    df.to_csv(csv_path, index=False)
+    if pa is not None:
+        table = pa.Table.from_pandas(out, preserve_index=False)
+        pacsv.write_csv(table, csv_path, pacsv.WriteOptions(quoting_style='needed'))
+    else:
+        out.to_csv(csv_path, index=False)
     print(f"✓ Dataset saved to: {csv_path}")
     
-    # JSON (para facilitar importação)
-    json_path = f'{output_dir}/fraud_transactions.json'
-    df.to_json(json_path, orient='records', indent=2)
-    print(f"✓ Dataset saved to: {json_path}")
-    
-    # Estatísticas do dataset
+    # Parquet (tipado e comprimido; bem mais rápido de recarregar que o CSV)
+    if pa is not None:
+        parquet_path = f'{output_dir}/fraud_transactions.parquet'
+        pq.write_table(table, parquet_path, compression='zstd')
+        print(f"✓ Dataset saved to: {parquet_path}")
+    
+    # JSON Lines (opcional, para facilitar importação); to_json já serializa em C
+    if save_json:
+        json_path = f'{output_dir}/fraud_transactions.jsonl'
+        out.to_json(json_path, orient='records', lines=True)
+        print(f"✓ Dataset saved to: {json_path}")
+    
+    # Estatísticas do dataset (uma passada por coluna)
+    fraud_mask = df['IsFraud'].to_numpy() == 1
+    num_fraud = int(fraud_mask.sum())
+    amount = df['Amount'].describe()
+    num_unique = df[['UserID', 'DeviceID', 'CardID']].nunique()
     stats = {
         'total_transactions': len(df),
-        'fraud_transactions': int(df['IsFraud'].sum()),
-        'fraud_rate': float(df['IsFraud'].mean()),
+        'fraud_transactions': num_fraud,
+        'fraud_rate': num_fraud / len(df),
         'date_range': {
-            'start': df['Timestamp'].min(),
-            'end': df['Timestamp'].max()
+            'start': out['Timestamp'].min(),
+            'end': out['Timestamp'].max()
         },
         'amount_statistics': {
-            'mean': float(df['Amount'].mean()),
-            'median': float(df['Amount'].median()),
-            'std': float(df['Amount'].std()),
-            'min': float(df['Amount'].min()),
-            'max': float(df['Amount'].max())
+            'mean': float(amount['mean']),
+            'median': float(amount['50%']),
+            'std': float(amount['std']),
+            'min': float(amount['min']),
+            'max': float(amount['max'])
         },
-        'fraud_scenarios': df[df['IsFraud'] == 1]['FraudScenario'].value_counts().to_dict(),
-        'services': df['Service'].value_counts().to_dict(),
-        'channels': df['Channel'].value_counts().to_dict(),
-        'unique_users': len(df['UserID'].unique()),
-        'unique_devices': len(df['DeviceID'].unique()),
-        'unique_cards': len(df['CardID'].unique()),
+        'fraud_scenarios': _category_counts(df['FraudScenario'][fraud_mask]),
+        'services': _category_counts(df['Service']),
+        'channels': _category_counts(df['Channel']),
+        'unique_users': int(num_unique['UserID']),
+        'unique_devices': int(num_unique['DeviceID']),
+        'unique_cards': int(num_unique['CardID']),
     }
     
     stats_path = f'{output_dir}/dataset_statistics.json'
@@ -281,8 +394,8 @@ def save_dataset(df, output_dir='/home/ubuntu/securebank_analysis/securebank-sim
         json.dump(stats, f, indent=2)
     print(f"✓ Statistics saved to: {stats_path}")
     
-    # Relatório descritivo
-    report = f"""
+    # Relatório descritivo (partes juntadas no fim com "".join)
+    parts = [f"""
 # Synthetic Fraud Dataset - Statistical Report
 
 ## Dataset Overview
@@ -306,21 +419,21 @@ def save_dataset(df, output_dir='/home/ubuntu/securebank_analysis/securebank-sim
 - **Unique Cards:** {stats['unique_cards']:,}
 
 ## Fraud Scenarios Distribution
-"""
+"""]
     for scenario, count in sorted(stats['fraud_scenarios'].items(), key=lambda x: x[1], reverse=True):
-        report += f"- **{scenario}:** {count} ({count/stats['fraud_transactions']*100:.1f}%)\n"
+        parts.append(f"- **{scenario}:** {count} ({count/stats['fraud_transactions']*100:.1f}%)\n")
     
-    report += "\n## Service Distribution\n"
+    parts.append("\n## Service Distribution\n")
     for service, count in sorted(stats['services'].items(), key=lambda x: x[1], reverse=True):
-        report += f"- **{service}:** {count} ({count/stats['total_transactions']*100:.1f}%)\n"
+        parts.append(f"- **{service}:** {count} ({count/stats['total_transactions']*100:.1f}%)\n")
     
-    report += "\n## Channel Distribution\n"
+    parts.append("\n## Channel Distribution\n")
     for channel, count in sorted(stats['channels'].items(), key=lambda x: x[1], reverse=True):
-        report += f"- **{channel}:** {count} ({count/stats['total_transactions']*100:.1f}%)\n"
+        parts.append(f"- **{channel}:** {count} ({count/stats['total_transactions']*100:.1f}%)\n")
     
     report_path = f'{output_dir}/dataset_report.md'
     with open(report_path, 'w') as f:
-        f.write(report)
+        f.write("".join(parts))
     print(f"✓ Report saved to: {report_path}")
     
     return stats
@@ -353,9 +466,9 @@ if __name__ == '__main__':
     
     # Preview
     print("\n### Sample Transactions (first 5):")
-    print(df.head().to_string())
+    print(format_for_export(df.head()).to_string())
     
     print("\n### Fraud Sample (first 3 fraud cases):")
     fraud_df = df[df['IsFraud'] == 1].head(3)
     if len(fraud_df) > 0:
-        print(fraud_df.to_string())
+        print(format_for_export(fraud_df).to_string())
@@ -6,15 +6,250 @@ para validação empírica do SecureBank™.
 """
 
 import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # só exportamos PNG: sem backend interativo
+import matplotlib.image as mpimg
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.figure import SubplotParams
 from pathlib import Path
 from typing import Dict, Any
 
+from log_io import iter_logs
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # orjson é opcional
+    orjson = None
+
+try:
+    import ijson  # type: ignore
+except ImportError:  # ijson é opcional
+    ijson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 # Configuração de estilo para artigos científicos
 plt.style.use('seaborn-v0_8-paper')
-sns.set_palette("husl")
+# ciclo de cores "husl" do seaborn (6 cores), sem importar o seaborn
+plt.rcParams['axes.prop_cycle'] = plt.cycler(
+    color=['#f77189', '#bb9832', '#50b131', '#36ada4', '#3ba3ec', '#e866f4'])
+
+# Figure reaproveitada entre os gráficos do processo (ver _new_figure)
+_FIG = None
+
+# zlib nível 1: savefig mais rápido, PNGs maiores (como em benchmark_plots)
+PNG_SAVE_KWARGS = {'pil_kwargs': {'compress_level': 1}}
+
+# Threads que codificam/gravam PNGs em segundo plano (ver _save_figure);
+# só existem durante generate_all_empirical_plots sem processos
+_SAVE_POOL = None
+_PENDING_SAVES = []
+
+
+def _new_figure(figsize, nrows: int = 1, ncols: int = 1):
+    """
+    Limpa e redimensiona a Figure compartilhada e cria os eixos
+    (mesmo retorno de plt.subplots), em vez de criar e fechar uma
+    Figure por gráfico.
+    """
+    global _FIG
+    if _FIG is None:
+        _FIG = plt.figure()
+    _FIG.clear()
+    # clear() não desfaz o subplots_adjust do tight_layout anterior
+    _FIG.subplotpars = SubplotParams()
+    _FIG.set_size_inches(*figsize)
+    return _FIG, _FIG.subplots(nrows, ncols)
+
+
+def _close_figure() -> None:
+    """Libera a Figure compartilhada."""
+    global _FIG
+    if _FIG is not None:
+        plt.close(_FIG)
+        _FIG = None
+
+
+def _render_rgba(fig, dpi: int) -> np.ndarray:
+    """Desenha a figura no Agg a dpi e devolve uma cópia do buffer RGBA."""
+    original_dpi = fig.dpi
+    fig.dpi = dpi
+    try:
+        fig.canvas.draw()
+        return np.array(fig.canvas.buffer_rgba())
+    finally:
+        fig.dpi = original_dpi
+
+
+def _save_figure(fig, output_path: str, **kwargs) -> None:
+    """
+    fig.savefig a 300 dpi; PNG_SAVE_KWARGS só vale para .png (PDF/SVG não aceitam).
+    
+    Com _SAVE_POOL ativo, um PNG sem opções extras é só rasterizado aqui:
+    a codificação (zlib) e a escrita vão para uma thread, enquanto o
+    próximo gráfico é montado. O arquivo é o mesmo do savefig.
+    """
+    is_png = str(output_path).lower().endswith('.png')
+    if _SAVE_POOL is not None and is_png and not kwargs:
+        rgba = _render_rgba(fig, 300)
+        _PENDING_SAVES.append(_SAVE_POOL.submit(
+            mpimg.imsave, output_path, rgba, format='png', origin='upper', dpi=300,
+            **PNG_SAVE_KWARGS))
+        return
+    if is_png:
+        kwargs.update(PNG_SAVE_KWARGS)
+    fig.savefig(output_path, dpi=300, **kwargs)
+
+
+@lru_cache(maxsize=32)
+def _load_json_cached(path: str, mtime_ns: int) -> Any:
+    return _json_loads(Path(path).read_bytes())
+
+
+@lru_cache(maxsize=4)
+def _load_amounts_cached(path: str, mtime_ns: int) -> np.ndarray:
+    amounts = _read_amounts(Path(path))
+    amounts.flags.writeable = False
+    return amounts
+
+
+def _read_amounts(path: Path) -> np.ndarray:
+    """
+    Extrai só tx.amount de um arquivo de logs (JSON com lista ou JSONL),
+    sem manter a lista de eventos em memória: os valores vão direto para
+    um buffer de floats. Para .json precisa do ijson; sem ele, cai na
+    leitura completa do arquivo.
+    """
+    buf = array('d')
+    if path.suffix == '.jsonl':
+        buf.extend(log['tx']['amount'] for log in iter_logs(path))
+    elif ijson is not None:
+        with open(path, 'rb') as f:
+            buf.extend(ijson.items(f, 'item.tx.amount', use_float=True))
+    else:
+        buf.extend(log['tx']['amount'] for log in _json_loads(path.read_bytes()))
+    return np.frombuffer(buf, dtype=np.float64)
+
+
+def _use_cache() -> bool:
+    # SECUREBANK_NO_CACHE=1 força a releitura dos arquivos
+    return os.environ.get("SECUREBANK_NO_CACHE") != "1"
+
+
+def _load_json(path: Path) -> Any:
+    """
+    Lê um JSON, memoizado por (caminho, mtime): regerar os gráficos no
+    mesmo processo não relê arquivos que não mudaram. O objeto devolvido
+    é compartilhado entre chamadas e não deve ser modificado.
+    """
+    if not _use_cache():
+        return _json_loads(path.read_bytes())
+    return _load_json_cached(str(path), path.stat().st_mtime_ns)
+
+
+def _load_amounts(path: Path) -> np.ndarray:
+    """Como _load_json, devolvendo só os valores (tx.amount) dos logs."""
+    if not _use_cache():
+        return _read_amounts(path)
+    return _load_amounts_cached(str(path), path.stat().st_mtime_ns)
+
+
+def _logs_path(jsonl_path: Path) -> Path:
+    """
+    Caminho de um arquivo de logs: o .jsonl ou, em diretórios gerados antes
+    da troca para JSON Lines, o .json de mesmo nome.
+    """
+    if jsonl_path.exists():
+        return jsonl_path
+    legacy = jsonl_path.with_suffix('.json')
+    return legacy if legacy.exists() else jsonl_path
+
+
+def _as_amounts(logs) -> np.ndarray:
+    # aceita lista de eventos ou array de valores já extraído (_load_amounts)
+    if isinstance(logs, np.ndarray):
+        return logs
+    return np.fromiter((log['tx']['amount'] for log in logs),
+                       dtype=np.float64, count=len(logs))
+
+
+def _sorted_percentiles(sorted_values: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    np.percentile(values, q) (interpolação linear) para um array já
+    ordenado: só indexa, sem particionar de novo.
+    """
+    pos = np.asarray(q, dtype=np.float64) / 100.0 * (len(sorted_values) - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, len(sorted_values) - 1)
+    frac = pos - lo
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * frac
+
+
+# Acima disso a linha da CDF é desenhada com pontos igualmente espaçados
+# (a diferença não aparece na figura, mas o número de vértices cai muito)
+MAX_CDF_POINTS = 20_000
+
+
+@lru_cache(maxsize=8)
+def _cdf_axis(n: int):
+    """
+    (índices, F(x)) dos pontos desenhados da CDF de n amostras, memoizado
+    por n. Dizimando, F(x) só é calculado nos índices usados.
+    """
+    if n <= MAX_CDF_POINTS:
+        idx = None
+        cdf = np.arange(1, n + 1) / n
+    else:
+        idx = np.unique(np.linspace(0, n - 1, MAX_CDF_POINTS).astype(np.intp))
+        cdf = (idx + 1) / n
+        idx.flags.writeable = False
+    cdf.flags.writeable = False
+    return idx, cdf
+
+
+def _cdf_points(sorted_values: np.ndarray):
+    """(x, F(x)) da CDF empírica, com no máximo ~MAX_CDF_POINTS pontos (inclui o último)."""
+    idx, cdf = _cdf_axis(len(sorted_values))
+    if idx is None:
+        return sorted_values, cdf
+    return sorted_values[idx], cdf
+
+
+def _box_stats(sorted_values: np.ndarray, label: str, whis: float = 1.5) -> Dict[str, Any]:
+    """
+    Estatísticas de ax.bxp (as mesmas de cbook.boxplot_stats) a partir de
+    um array já ordenado: quartis por indexação, bigodes e outliers por
+    busca binária.
+    """
+    q1, med, q3 = _sorted_percentiles(sorted_values, (25, 50, 75))
+    iqr = q3 - q1
+    lo = np.searchsorted(sorted_values, q1 - whis * iqr, side='left')
+    hi = np.searchsorted(sorted_values, q3 + whis * iqr, side='right')
+    return {
+        'label': label,
+        'med': med, 'q1': q1, 'q3': q3,
+        'whislo': min(sorted_values[lo], q1),
+        'whishi': max(sorted_values[hi - 1], q3),
+        'fliers': np.concatenate([sorted_values[:lo], sorted_values[hi:]]),
+    }
+
+
+def _blocked_rates(detection: Dict, scenarios: list, pdp: str) -> np.ndarray:
+    """
+    Taxa de bloqueio (%) por cenário para um PDP ('baseline'/'securebank');
+    0 onde o cenário não tem ataques.
+    """
+    total = np.fromiter((detection[s]['total_attacks'] for s in scenarios),
+                        dtype=np.float64, count=len(scenarios))
+    blocked = np.fromiter((detection[s][pdp]['blocked'] for s in scenarios),
+                          dtype=np.float64, count=len(scenarios))
+    rates = np.divide(blocked, total, out=np.zeros_like(total), where=total > 0)
+    return rates * 100
 
 
 def plot_metrics_comparison(
@@ -32,7 +267,7 @@ def plot_metrics_comparison(
     """
     metrics = ['TII', 'SAE', 'ITAL']
     
-    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+    fig, axes = _new_figure((15, 5), 1, 3)
     fig.suptitle('Simulation vs. Real Data: Metrics Comparison', fontsize=14, fontweight='bold')
     
     for idx, metric in enumerate(metrics):
@@ -63,16 +298,11 @@ def plot_metrics_comparison(
         ax.grid(axis='y', alpha=0.3)
         
         # Adiciona valores nas barras
-        for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{height:.3f}',
-                       ha='center', va='bottom', fontsize=9)
+        for bars in (bars1, bars2):
+            ax.bar_label(bars, fmt='%.3f', fontsize=9)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    _save_figure(fig, output_path)
     
     print(f"✓ Saved: {output_path}")
 
@@ -90,7 +320,7 @@ def plot_correlation_scatter(
     """
     metrics = ['TII', 'SAE', 'ITAL']
     
-    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+    fig, axes = _new_figure((15, 5), 1, 3)
     fig.suptitle('Correlation: Simulation vs. Real Data', fontsize=14, fontweight='bold')
     
     for idx, metric in enumerate(metrics):
@@ -98,8 +328,9 @@ def plot_correlation_scatter(
         
         sim_vals = correlation[metric]['simulation_values']
         real_vals = correlation[metric]['real_values']
-        r = correlation[metric]['pearson_r']
-        p = correlation[metric]['p_value']
+        # formatados uma vez: usados no título e na anotação
+        r_s = f"{correlation[metric]['pearson_r']:.4f}"
+        p_s = f"{correlation[metric]['p_value']:.4f}"
         
         # Scatter plot
         ax.scatter(sim_vals, real_vals, s=150, alpha=0.7, 
@@ -111,27 +342,33 @@ def plot_correlation_scatter(
         ax.plot([min_val, max_val], [min_val, max_val], 
                'k--', alpha=0.5, label='Perfect correlation (y=x)')
         
-        # Linha de regressão
-        z = np.polyfit(sim_vals, real_vals, 1)
-        p_fit = np.poly1d(z)
-        x_line = np.linspace(min_val, max_val, 100)
-        ax.plot(x_line, p_fit(x_line), 'g-', alpha=0.7, linewidth=2, label='Regression line')
+        # Linha de regressão (mínimos quadrados de grau 1 em forma fechada;
+        # sem variância em x a reta não é definida e não é desenhada)
+        x = np.asarray(sim_vals, dtype=np.float64)
+        y = np.asarray(real_vals, dtype=np.float64)
+        dx = x - x.mean()
+        sxx = dx @ dx
+        if sxx > 0:
+            slope = (dx @ (y - y.mean())) / sxx
+            intercept = y.mean() - slope * x.mean()
+            x_line = np.linspace(min_val, max_val, 100)
+            ax.plot(x_line, slope * x_line + intercept, 'g-', alpha=0.7, linewidth=2,
+                    label='Regression line')
         
         # Configuração
         ax.set_xlabel('Simulation', fontsize=11)
         ax.set_ylabel('Real Data', fontsize=11)
-        ax.set_title(f'{metric}: r={r:.4f}, p={p:.4f}', fontsize=12, fontweight='bold')
+        ax.set_title(f'{metric}: r={r_s}, p={p_s}', fontsize=12, fontweight='bold')
         ax.legend(fontsize=8)
         ax.grid(alpha=0.3)
         
         # Anotações
-        ax.text(0.05, 0.95, f'Pearson r = {r:.4f}\np-value = {p:.4f}',
+        ax.text(0.05, 0.95, f'Pearson r = {r_s}\np-value = {p_s}',
                transform=ax.transAxes, fontsize=9,
                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    _save_figure(fig, output_path)
     
     print(f"✓ Saved: {output_path}")
 
@@ -152,22 +389,20 @@ def plot_improvement_comparison(
     metrics = ['TII', 'SAE', 'ITAL']
     
     # Calcula melhorias percentuais
-    improvements_sim = []
-    improvements_real = []
-    
-    for metric in metrics:
-        # Simulação
-        baseline_sim = simulation_metrics[metric]['baseline']
-        sb_sim = simulation_metrics[metric]['securebank']
-        improvement_sim = ((sb_sim - baseline_sim) / baseline_sim * 100) if baseline_sim > 0 else 0
-        improvements_sim.append(improvement_sim)
-        
-        # Real
-        improvement_real = real_metrics[metric]['improvement']
-        improvements_real.append(improvement_real)
+    # Simulação: (securebank - baseline) / baseline, 0 onde baseline <= 0
+    baseline_sim = np.fromiter((simulation_metrics[m]['baseline'] for m in metrics),
+                               dtype=np.float64, count=len(metrics))
+    sb_sim = np.fromiter((simulation_metrics[m]['securebank'] for m in metrics),
+                         dtype=np.float64, count=len(metrics))
+    improvements_sim = np.divide(sb_sim - baseline_sim, baseline_sim,
+                                 out=np.zeros_like(baseline_sim), where=baseline_sim > 0) * 100
+    
+    # Real
+    improvements_real = np.fromiter((real_metrics[m]['improvement'] for m in metrics),
+                                    dtype=np.float64, count=len(metrics))
     
     # Gráfico
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure((10, 6))
     
     x = np.arange(len(metrics))
     width = 0.35
@@ -187,45 +422,49 @@ def plot_improvement_comparison(
     ax.grid(axis='y', alpha=0.3)
     ax.axhline(y=0, color='k', linestyle='-', linewidth=0.5)
     
-    # Adiciona valores nas barras
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}%',
-                   ha='center', va='bottom' if height >= 0 else 'top', fontsize=10)
+    # Adiciona valores nas barras (bar_label põe abaixo das barras negativas)
+    for bars in (bars1, bars2):
+        ax.bar_label(bars, fmt='%.1f%%', fontsize=10)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    _save_figure(fig, output_path)
     
     print(f"✓ Saved: {output_path}")
 
 
 def plot_distribution_comparison(
-    real_logs: list,
-    simulation_logs: list,
+    real_logs,
+    simulation_logs,
     output_path: str
 ) -> None:
     """
     Compara distribuições de valores de transação entre simulação e dados reais.
     
     Args:
-        real_logs: Logs dos dados reais
-        simulation_logs: Logs da simulação
+        real_logs: Logs dos dados reais (lista de eventos ou array de valores)
+        simulation_logs: Logs da simulação (lista de eventos ou array de valores)
         output_path: Caminho para salvar o gráfico
     """
-    # Extrai valores
-    real_amounts = [log['tx']['amount'] for log in real_logs]
-    sim_amounts = [log['tx']['amount'] for log in simulation_logs]
+    # Extrai valores (arrays float64, reaproveitados por todos os subplots)
+    real_amounts = _as_amounts(real_logs)
+    sim_amounts = _as_amounts(simulation_logs)
     
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig, axes = _new_figure((14, 10), 2, 2)
     fig.suptitle('Distribution Comparison: Simulation vs. Real Data', fontsize=14, fontweight='bold')
     
-    # 1. Histogramas
+    # Arrays ordenados uma vez: histograma, box plot, CDF e Q-Q partem deles
+    sorted_sim = np.sort(sim_amounts)
+    sorted_real = np.sort(real_amounts)
+    
+    # 1. Histogramas (mesmas 50 faixas para as duas séries, desenhadas com stairs)
     ax = axes[0, 0]
-    ax.hist(sim_amounts, bins=50, alpha=0.6, label='Simulation', density=True, color='#3498db')
-    ax.hist(real_amounts, bins=50, alpha=0.6, label='Real Data', density=True, color='#e74c3c')
+    # bordas a partir só dos extremos (mesmo resultado que sobre os dados concatenados)
+    edges = np.histogram_bin_edges([min(sorted_sim[0], sorted_real[0]),
+                                    max(sorted_sim[-1], sorted_real[-1])], bins=50)
+    for values, label, color in ((sorted_sim, 'Simulation', '#3498db'),
+                                 (sorted_real, 'Real Data', '#e74c3c')):
+        counts, _ = np.histogram(values, bins=edges, density=True)
+        ax.stairs(counts, edges, fill=True, alpha=0.6, label=label, color=color)
     ax.set_xlabel('Transaction Amount ($)', fontsize=11)
     ax.set_ylabel('Density', fontsize=11)
     ax.set_title('Transaction Amount Distribution', fontsize=12, fontweight='bold')
@@ -234,10 +473,10 @@ def plot_distribution_comparison(
     
     # 2. Box plots
     ax = axes[0, 1]
-    bp = ax.boxplot([sim_amounts, real_amounts],
-                    labels=['Simulation', 'Real Data'],
-                    patch_artist=True,
-                    widths=0.6)
+    bp = ax.bxp([_box_stats(sorted_sim, 'Simulation'),
+                 _box_stats(sorted_real, 'Real Data')],
+                patch_artist=True,
+                widths=0.6)
     colors = ['#3498db', '#e74c3c']
     for patch, color in zip(bp['boxes'], colors):
         patch.set_facecolor(color)
@@ -248,12 +487,10 @@ def plot_distribution_comparison(
     
     # 3. CDF (Cumulative Distribution Function)
     ax = axes[1, 0]
-    sorted_sim = np.sort(sim_amounts)
-    sorted_real = np.sort(real_amounts)
-    cdf_sim = np.arange(1, len(sorted_sim)+1) / len(sorted_sim)
-    cdf_real = np.arange(1, len(sorted_real)+1) / len(sorted_real)
-    ax.plot(sorted_sim, cdf_sim, label='Simulation', color='#3498db', linewidth=2)
-    ax.plot(sorted_real, cdf_real, label='Real Data', color='#e74c3c', linewidth=2)
+    # sem rasterized=True: no PNG não muda nada e, com a CDF já limitada a
+    # MAX_CDF_POINTS, deixou o PDF maior e mais lento de gravar
+    ax.plot(*_cdf_points(sorted_sim), label='Simulation', color='#3498db', linewidth=2)
+    ax.plot(*_cdf_points(sorted_real), label='Real Data', color='#e74c3c', linewidth=2)
     ax.set_xlabel('Transaction Amount ($)', fontsize=11)
     ax.set_ylabel('Cumulative Probability', fontsize=11)
     ax.set_title('Cumulative Distribution Function (CDF)', fontsize=12, fontweight='bold')
@@ -262,13 +499,14 @@ def plot_distribution_comparison(
     
     # 4. Q-Q Plot
     ax = axes[1, 1]
-    # Normaliza para quantis
-    sim_quantiles = np.percentile(sim_amounts, np.arange(0, 101, 1))
-    real_quantiles = np.percentile(real_amounts, np.arange(0, 101, 1))
+    # Normaliza para quantis (a partir dos arrays já ordenados para a CDF)
+    percentiles = np.arange(0, 101, 1)
+    sim_quantiles = _sorted_percentiles(sorted_sim, percentiles)
+    real_quantiles = _sorted_percentiles(sorted_real, percentiles)
     ax.scatter(sim_quantiles, real_quantiles, alpha=0.6, s=30, color='#2ecc71')
-    # Linha de identidade
-    min_val = min(min(sim_quantiles), min(real_quantiles))
-    max_val = max(max(sim_quantiles), max(real_quantiles))
+    # Linha de identidade (quantis já saem ordenados: extremos nas pontas)
+    min_val = min(sim_quantiles[0], real_quantiles[0])
+    max_val = max(sim_quantiles[-1], real_quantiles[-1])
     ax.plot([min_val, max_val], [min_val, max_val], 'k--', alpha=0.5, label='Perfect match')
     ax.set_xlabel('Simulation Quantiles ($)', fontsize=11)
     ax.set_ylabel('Real Data Quantiles ($)', fontsize=11)
@@ -276,9 +514,8 @@ def plot_distribution_comparison(
     ax.legend()
     ax.grid(alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    _save_figure(fig, output_path)
     
     print(f"✓ Saved: {output_path}")
 
@@ -303,7 +540,7 @@ def plot_attack_detection_comparison(
         print("⚠ No common scenarios found for comparison")
         return
     
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = _new_figure((16, 6), 1, 2)
     fig.suptitle('Attack Detection by Scenario: Simulation vs. Real Data', fontsize=14, fontweight='bold')
     
     # Baseline
@@ -311,16 +548,8 @@ def plot_attack_detection_comparison(
     scenario_names = [real_scenario_detection[s]['name'] for s in scenarios]
     
     # Taxa de bloqueio baseline
-    baseline_sim_blocked = [
-        (sim_scenario_detection[s]['baseline']['blocked'] / sim_scenario_detection[s]['total_attacks'] * 100)
-        if sim_scenario_detection[s]['total_attacks'] > 0 else 0
-        for s in scenarios
-    ]
-    baseline_real_blocked = [
-        (real_scenario_detection[s]['baseline']['blocked'] / real_scenario_detection[s]['total_attacks'] * 100)
-        if real_scenario_detection[s]['total_attacks'] > 0 else 0
-        for s in scenarios
-    ]
+    baseline_sim_blocked = _blocked_rates(sim_scenario_detection, scenarios, 'baseline')
+    baseline_real_blocked = _blocked_rates(real_scenario_detection, scenarios, 'baseline')
     
     x = np.arange(len(scenario_names))
     width = 0.35
@@ -338,16 +567,8 @@ def plot_attack_detection_comparison(
     ax = axes[1]
     
     # Taxa de bloqueio SecureBank
-    sb_sim_blocked = [
-        (sim_scenario_detection[s]['securebank']['blocked'] / sim_scenario_detection[s]['total_attacks'] * 100)
-        if sim_scenario_detection[s]['total_attacks'] > 0 else 0
-        for s in scenarios
-    ]
-    sb_real_blocked = [
-        (real_scenario_detection[s]['securebank']['blocked'] / real_scenario_detection[s]['total_attacks'] * 100)
-        if real_scenario_detection[s]['total_attacks'] > 0 else 0
-        for s in scenarios
-    ]
+    sb_sim_blocked = _blocked_rates(sim_scenario_detection, scenarios, 'securebank')
+    sb_real_blocked = _blocked_rates(real_scenario_detection, scenarios, 'securebank')
     
     ax.bar(x - width/2, sb_sim_blocked, width, label='Simulation', alpha=0.8, color='#3498db')
     ax.bar(x + width/2, sb_real_blocked, width, label='Real Data', alpha=0.8, color='#e74c3c')
@@ -358,9 +579,8 @@ def plot_attack_detection_comparison(
     ax.legend()
     ax.grid(axis='y', alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    _save_figure(fig, output_path)
     
     print(f"✓ Saved: {output_path}")
 
@@ -376,7 +596,7 @@ def plot_validation_summary_table(
         correlation: Dados de correlação
         output_path: Caminho para salvar a imagem da tabela
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure((12, 6))
     ax.axis('tight')
     ax.axis('off')
     
@@ -405,9 +625,19 @@ def plot_validation_summary_table(
             ]
         table_data.append(row)
     
+    # Cores das células: linhas zebradas e a linha Overall (verde na coluna
+    # de validade quando passa), passadas de uma vez para ax.table
+    n_cols = 6
+    cell_colours = [['#ffffff' if i % 2 == 0 else '#f7f9fa'] * n_cols
+                    for i in range(1, len(metrics))]
+    overall_ok = '✓' in table_data[-1][n_cols - 1]
+    cell_colours.append(['#e8f4f8'] * (n_cols - 1) + ['#2ecc71' if overall_ok else '#e8f4f8'])
+    
     # Cria tabela
     table = ax.table(cellText=table_data,
+                    cellColours=cell_colours,
                     colLabels=['Metric', 'Pearson r', 'Significance', 'MAE', 'MRE', 'Valid (r≥0.70)'],
+                    colColours=['#3498db'] * n_cols,
                     cellLoc='center',
                     loc='center',
                     colWidths=[0.12, 0.12, 0.18, 0.12, 0.12, 0.18])
@@ -416,30 +646,32 @@ def plot_validation_summary_table(
     table.set_fontsize(10)
     table.scale(1, 2.5)
     
-    # Estilização
-    for i in range(len(metrics) + 1):
-        for j in range(6):
-            cell = table[(i, j)]
-            if i == 0:  # Header
-                cell.set_facecolor('#3498db')
-                cell.set_text_props(weight='bold', color='white')
-            elif i == len(metrics):  # Overall row
-                cell.set_facecolor('#2ecc71' if j == 5 and '✓' in table_data[i-1][j] else '#e8f4f8')
-                cell.set_text_props(weight='bold')
-            else:
-                cell.set_facecolor('#ffffff' if i % 2 == 0 else '#f7f9fa')
-    
-    plt.title('Empirical Validation Summary', fontsize=14, fontweight='bold', pad=20)
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    # Texto em negrito só no cabeçalho e na linha Overall
+    for j in range(n_cols):
+        table[(0, j)].set_text_props(weight='bold', color='white')
+        table[(len(metrics), j)].set_text_props(weight='bold')
+    
+    ax.set_title('Empirical Validation Summary', fontsize=14, fontweight='bold', pad=20)
+    # sem tight_layout aqui: o recorte pelo bbox remove a margem em volta da tabela
+    _save_figure(fig, output_path, bbox_inches='tight')
     
     print(f"✓ Saved: {output_path}")
 
 
+def _run_plot(job):
+    """
+    Worker: chama uma das funções plot_* (de módulo, logo picklable).
+    A Figure compartilhada do processo é reaproveitada entre os jobs.
+    """
+    plot_func, args = job
+    plot_func(*args)
+
+
 def generate_all_empirical_plots(
     empirical_results_dir: str,
     simulation_results_dir: str,
-    output_dir: str
+    output_dir: str,
+    max_workers: int = None
 ) -> None:
     """
     Gera todos os gráficos de validação empírica.
@@ -448,7 +680,11 @@ def generate_all_empirical_plots(
         empirical_results_dir: Diretório com resultados empíricos
         simulation_results_dir: Diretório com resultados da simulação
         output_dir: Diretório de saída para os gráficos
+        max_workers: Número de processos (padrão: min(nº de gráficos, os.cpu_count()));
+                     com 1, gera tudo no processo atual
     """
+    global _SAVE_POOL
+    
     print("\n" + "="*70)
     print("Generating Empirical Validation Plots")
     print("="*70)
@@ -458,59 +694,63 @@ def generate_all_empirical_plots(
     out_path = Path(output_dir)
     out_path.mkdir(parents=True, exist_ok=True)
     
-    # Carrega dados
-    with open(emp_path / "empirical_metrics.json", 'r') as f:
-        metrics_data = json.load(f)
-        real_metrics = metrics_data['real_metrics']
-        simulation_metrics = metrics_data['simulation_metrics']
+    # Carrega dados (memoizado por caminho + mtime, ver _load_json)
+    metrics_data = _load_json(emp_path / "empirical_metrics.json")
+    real_metrics = metrics_data['real_metrics']
+    simulation_metrics = metrics_data['simulation_metrics']
     
-    with open(emp_path / "empirical_correlation.json", 'r') as f:
-        correlation = json.load(f)
+    correlation = _load_json(emp_path / "empirical_correlation.json")
     
-    with open(emp_path / "empirical_securebank_logs_sample.json", 'r') as f:
-        real_logs = json.load(f)
+    # dos logs só os valores são usados: lidos em streaming para arrays
+    real_amounts = _load_amounts(_logs_path(emp_path / "empirical_securebank_logs_sample.jsonl"))
     
-    with open(sim_path / "securebank_logs_run0.json", 'r') as f:
-        sim_logs = json.load(f)
+    sim_amounts = _load_amounts(_logs_path(sim_path / "securebank_logs_run0.jsonl"))
     
-    with open(emp_path / "empirical_scenario_detection.json", 'r') as f:
-        real_scenario_detection = json.load(f)
+    real_scenario_detection = _load_json(emp_path / "empirical_scenario_detection.json")
     
-    with open(sim_path / "scenario_detection_run0.json", 'r') as f:
-        sim_scenario_detection = json.load(f)
+    sim_scenario_detection = _load_json(sim_path / "scenario_detection_run0.json")
     
     # Gera gráficos
     print("\nGenerating plots...")
     
-    plot_metrics_comparison(
-        real_metrics, simulation_metrics,
-        str(out_path / "empirical_metrics_comparison.png")
-    )
-    
-    plot_correlation_scatter(
-        correlation,
-        str(out_path / "empirical_correlation_scatter.png")
-    )
-    
-    plot_improvement_comparison(
-        real_metrics, simulation_metrics,
-        str(out_path / "empirical_improvement_comparison.png")
-    )
-    
-    plot_distribution_comparison(
-        real_logs, sim_logs,
-        str(out_path / "empirical_distribution_comparison.png")
-    )
-    
-    plot_attack_detection_comparison(
-        real_scenario_detection, sim_scenario_detection,
-        str(out_path / "empirical_attack_detection_comparison.png")
-    )
-    
-    plot_validation_summary_table(
-        correlation,
-        str(out_path / "empirical_validation_summary.png")
-    )
+    # Cada gráfico é independente e grava o próprio PNG
+    plots = [
+        (plot_metrics_comparison,
+         (real_metrics, simulation_metrics,
+          str(out_path / "empirical_metrics_comparison.png"))),
+        (plot_correlation_scatter,
+         (correlation, str(out_path / "empirical_correlation_scatter.png"))),
+        (plot_improvement_comparison,
+         (real_metrics, simulation_metrics,
+          str(out_path / "empirical_improvement_comparison.png"))),
+        (plot_distribution_comparison,
+         (real_amounts, sim_amounts,
+          str(out_path / "empirical_distribution_comparison.png"))),
+        (plot_attack_detection_comparison,
+         (real_scenario_detection, sim_scenario_detection,
+          str(out_path / "empirical_attack_detection_comparison.png"))),
+        (plot_validation_summary_table,
+         (correlation, str(out_path / "empirical_validation_summary.png"))),
+    ]
+    
+    max_workers = max_workers or min(len(plots), os.cpu_count() or 1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # list() propaga exceções dos workers
+            list(executor.map(_run_plot, plots))
+    else:
+        _SAVE_POOL = ThreadPoolExecutor(max_workers=2)
+        try:
+            for job in plots:
+                _run_plot(job)
+        finally:
+            _SAVE_POOL.shutdown(wait=True)
+            _SAVE_POOL = None
+            _close_figure()
+            pending = _PENDING_SAVES[:]
+            _PENDING_SAVES.clear()
+        for future in pending:
+            future.result()  # propaga erros de gravação
     
     print("\n" + "="*70)
     print(f"All plots saved to: {output_dir}")
@@ -11,13 +11,15 @@ e validando a generalização dos modelos.
 import json
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
-from collections import defaultdict
-from scipy import stats
+from typing import Dict, List, Any, Sequence, Tuple
+from collections import Counter
 
 from real_data_adapter import RealDataAdapter, load_and_adapt_real_data
 from simulator import baseline_pdp, securebank_pdp
-from metrics import compute_tii, compute_sae, compute_ital, compute_scenario_detection
+from pdp_np import events_to_arrays, merged_logs, metrics_arrays, run_pdps, run_pdps_kernel
+from metrics import compute_all_metrics, compute_scenario_detection
+from log_io import dump_json, write_logs
+import metrics_np
 
 
 class EmpiricalValidator:
@@ -42,8 +44,13 @@ class EmpiricalValidator:
         # Resultados
         self.real_events = None
         self.real_stats = None
+        # tx.amount dos eventos reais como coluna float64 (ver load_real_data)
+        self.amounts = None
         self.baseline_logs = None
         self.securebank_logs = None
+        # (baseline, securebank) no formato de metrics_np, quando os PDPs
+        # rodaram no caminho colunar (ver _run_pdps_columnar)
+        self._metrics_arrays = None
         
         # Métricas
         self.real_metrics = {}
@@ -64,6 +71,9 @@ class EmpiricalValidator:
         self.real_events, self.real_stats = load_and_adapt_real_data(
             self.real_dataset_path
         )
+        # Valores extraídos uma vez: as estatísticas usam o array direto
+        self.amounts = np.fromiter((event['tx']['amount'] for event in self.real_events),
+                                   dtype=np.float64, count=len(self.real_events))
         
         print(f"\n✓ Loaded {len(self.real_events)} real transactions")
         print(f"  - Fraud rate: {self.real_stats['fraud_rate']*100:.2f}%")
@@ -72,12 +82,13 @@ class EmpiricalValidator:
         
         return self.real_events, self.real_stats
     
-    def run_pdps_on_real_data(self) -> Tuple[List[Dict], List[Dict]]:
+    def run_pdps_on_real_data(self) -> Tuple[Sequence[Dict], Sequence[Dict]]:
         """
         Executa os PDPs (baseline e SecureBank) sobre dados reais.
         
         Returns:
-            Tupla (baseline_logs, securebank_logs)
+            Tupla (baseline_logs, securebank_logs); no caminho colunar são
+            sequências (pdp_np.MergedLogs) que montam cada log ao ser acessado
         """
         if self.real_events is None:
             raise ValueError("Real data not loaded. Call load_real_data() first.")
@@ -89,6 +100,33 @@ class EmpiricalValidator:
         # Parâmetros ITAL do config
         ital_params = self.config.get("ital_params", {})
         
+        if run_pdps_kernel is not None:
+            baseline_logs, securebank_logs = self._run_pdps_columnar(ital_params)
+        else:
+            baseline_logs, securebank_logs = self._run_pdps_per_event(ital_params)
+        
+        self.baseline_logs = baseline_logs
+        self.securebank_logs = securebank_logs
+        
+        print(f"\n✓ Processed {len(baseline_logs)} transactions through both PDPs")
+        
+        return baseline_logs, securebank_logs
+    
+    def _run_pdps_columnar(self, ital_params: Dict) -> Tuple[Sequence[Dict], Sequence[Dict]]:
+        """
+        Os dois PDPs numa única passada do kernel compilado de pdp_np, sobre
+        arrays colunares dos eventos. As decisões ficam nos arrays: as
+        métricas usam self._metrics_arrays e os logs {**event, **decision}
+        só são montados quando lidos (amostra salva, detecção por cenário).
+        """
+        arrays = events_to_arrays(self.real_events)
+        decisions = run_pdps(arrays, ital_params)
+        self._metrics_arrays = metrics_arrays(arrays, decisions)
+        return merged_logs(self.real_events, decisions)
+    
+    def _run_pdps_per_event(self, ital_params: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """Os dois PDPs de simulator.py, evento a evento (sem numba)."""
+        self._metrics_arrays = None
         baseline_logs = []
         securebank_logs = []
         
@@ -96,11 +134,15 @@ class EmpiricalValidator:
         sb_state = {"I": {}, "D": {}, "profiles": {}}
         
         total = len(self.real_events)
+        # Progresso a cada ~1% (e no último evento), fora do caminho comum do laço
+        step = max(1, total // 100)
+        last = total - 1
+        pct = 100 / total if total else 0.0
         
         for i, event in enumerate(self.real_events):
             # Progress indicator
-            if (i + 1) % 1000 == 0 or i == total - 1:
-                print(f"  Processing: {i+1}/{total} transactions ({(i+1)/total*100:.1f}%)", end='\r')
+            if i == last or (i + 1) % step == 0:
+                print(f"  Processing: {i+1}/{total} transactions ({(i+1)*pct:.1f}%)", end='\r')
             
             # Baseline PDP
             base_decision = baseline_pdp(event)
@@ -112,11 +154,6 @@ class EmpiricalValidator:
         
         print()  # Nova linha após o progress
         
-        self.baseline_logs = baseline_logs
-        self.securebank_logs = securebank_logs
-        
-        print(f"\n✓ Processed {len(baseline_logs)} transactions through both PDPs")
-        
         return baseline_logs, securebank_logs
     
     def compute_real_metrics(self) -> Dict[str, float]:
@@ -135,15 +172,19 @@ class EmpiricalValidator:
         
         ital_params = self.config.get("ital_params", {})
         
-        # Métricas baseline
-        tii_baseline = compute_tii(self.baseline_logs)
-        sae_baseline = compute_sae(self.baseline_logs)
-        ital_baseline = compute_ital(self.baseline_logs, ital_params)
+        if self._metrics_arrays is not None:
+            # Caminho colunar: reduções sobre os arrays de decisão, sem
+            # montar os logs (kernel fundido de metrics_np)
+            base_arrays, sb_arrays = self._metrics_arrays
+            base_m = metrics_np.compute_all_metrics(base_arrays, ital_params)
+            sb_m = metrics_np.compute_all_metrics(sb_arrays, ital_params)
+        else:
+            # TII/SAE/ITAL numa única passada por conjunto de logs
+            base_m = compute_all_metrics(self.baseline_logs, ital_params)
+            sb_m = compute_all_metrics(self.securebank_logs, ital_params)
         
-        # Métricas SecureBank
-        tii_sb = compute_tii(self.securebank_logs)
-        sae_sb = compute_sae(self.securebank_logs)
-        ital_sb = compute_ital(self.securebank_logs, ital_params)
+        tii_baseline, sae_baseline, ital_baseline = base_m["TII"], base_m["SAE"], base_m["ITAL"]
+        tii_sb, sae_sb, ital_sb = sb_m["TII"], sb_m["SAE"], sb_m["ITAL"]
         
         self.real_metrics = {
             "TII": {
@@ -232,33 +273,44 @@ class EmpiricalValidator:
         print("Computing Correlation: Simulation vs. Real Data")
         print("="*70)
         
+        metric_names = ("TII", "SAE", "ITAL")
+        
+        # Matrizes métrica x (baseline, securebank)
+        sim_mat = np.array([[self.simulation_metrics[m]["baseline"], self.simulation_metrics[m]["securebank"]]
+                            for m in metric_names], dtype=np.float64)
+        real_mat = np.array([[self.real_metrics[m]["baseline"], self.real_metrics[m]["securebank"]]
+                             for m in metric_names], dtype=np.float64)
+        
+        # Correlação de Pearson: com só dois pontos (baseline, securebank) r é
+        # sempre ±1 (sinal das duas inclinações) e p = 1.0; com um dos lados
+        # constante r é indefinido (NaN), como em scipy.stats.pearsonr
+        slopes = (sim_mat[:, 1] - sim_mat[:, 0]) * (real_mat[:, 1] - real_mat[:, 0])
+        defined = slopes != 0
+        r_vals = np.where(defined, np.sign(slopes), np.nan)
+        p_vals = np.where(defined, 1.0, np.nan)
+        
+        # Diferença absoluta (erro médio) e relativa (%) por métrica
+        abs_diff = np.abs(sim_mat - real_mat)
+        positive = sim_mat > 0
+        rel_diff = np.where(positive, abs_diff / np.where(positive, sim_mat, 1.0) * 100, 0.0)
+        mean_abs_errors = abs_diff.mean(axis=1)
+        mean_rel_errors = rel_diff.mean(axis=1)
+        
         correlations = {}
         
-        for metric in ["TII", "SAE", "ITAL"]:
-            # Valores da simulação (baseline e securebank)
+        for k, metric in enumerate(metric_names):
             sim_vals = [
                 self.simulation_metrics[metric]["baseline"],
                 self.simulation_metrics[metric]["securebank"]
             ]
-            
-            # Valores dos dados reais (baseline e securebank)
             real_vals = [
                 self.real_metrics[metric]["baseline"],
                 self.real_metrics[metric]["securebank"]
             ]
-            
-            # Correlação de Pearson
-            r, p_value = stats.pearsonr(sim_vals, real_vals)
-            
-            # Diferença absoluta (erro médio)
-            abs_diff_baseline = abs(sim_vals[0] - real_vals[0])
-            abs_diff_sb = abs(sim_vals[1] - real_vals[1])
-            mean_abs_error = (abs_diff_baseline + abs_diff_sb) / 2
-            
-            # Diferença relativa (%)
-            rel_diff_baseline = abs_diff_baseline / sim_vals[0] * 100 if sim_vals[0] > 0 else 0
-            rel_diff_sb = abs_diff_sb / sim_vals[1] * 100 if sim_vals[1] > 0 else 0
-            mean_rel_error = (rel_diff_baseline + rel_diff_sb) / 2
+            r = r_vals[k]
+            p_value = p_vals[k]
+            mean_abs_error = mean_abs_errors[k]
+            mean_rel_error = mean_rel_errors[k]
             
             correlations[metric] = {
                 "pearson_r": r,
@@ -268,8 +320,8 @@ class EmpiricalValidator:
                 "mean_relative_error_pct": mean_rel_error,
                 "simulation_values": sim_vals,
                 "real_values": real_vals,
-                "baseline_diff": abs_diff_baseline,
-                "securebank_diff": abs_diff_sb,
+                "baseline_diff": abs_diff[k, 0],
+                "securebank_diff": abs_diff[k, 1],
             }
             
             print(f"\n{metric}:")
@@ -280,9 +332,9 @@ class EmpiricalValidator:
             print(f"  Real:       Baseline={real_vals[0]:.4f}, SecureBank={real_vals[1]:.4f}")
         
         # Correlação geral (média ponderada)
-        overall_r = np.mean([correlations[m]["pearson_r"] for m in ["TII", "SAE", "ITAL"]])
-        overall_mae = np.mean([correlations[m]["mean_absolute_error"] for m in ["TII", "SAE", "ITAL"]])
-        overall_mre = np.mean([correlations[m]["mean_relative_error_pct"] for m in ["TII", "SAE", "ITAL"]])
+        overall_r = r_vals.mean()
+        overall_mae = mean_abs_errors.mean()
+        overall_mre = mean_rel_errors.mean()
         
         correlations["overall"] = {
             "mean_pearson_r": overall_r,
@@ -324,31 +376,6 @@ class EmpiricalValidator:
         else:
             return "Weak correlation (r < 0.50)"
     
-    def _make_json_serializable(self, obj: Any) -> Any:
-        """
-        Converte objetos numpy para tipos Python nativos para serialização JSON.
-        
-        Args:
-            obj: Objeto a ser convertido
-            
-        Returns:
-            Objeto com tipos Python nativos
-        """
-        if isinstance(obj, dict):
-            return {key: self._make_json_serializable(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_json_serializable(item) for item in obj]
-        elif isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, (np.bool_, bool)):
-            return bool(obj)
-        else:
-            return obj
-    
     def analyze_distribution_similarity(self) -> Dict[str, Any]:
         """
         Analisa similaridade entre distribuições de transações reais e simuladas.
@@ -360,43 +387,55 @@ class EmpiricalValidator:
         print("Analyzing Distribution Similarity")
         print("="*70)
         
-        # Extrai valores de transações reais
-        real_amounts = [log['tx']['amount'] for log in self.baseline_logs]
-        real_services = [log['tx']['service'] for log in self.baseline_logs]
-        real_channels = [log['ctx']['channel'] for log in self.baseline_logs]
-        real_geos = [log['ctx']['geo'] for log in self.baseline_logs]
-        real_is_attack = [log['is_attack'] for log in self.baseline_logs]
+        # Campos das transações reais numa única passada (são campos do
+        # evento: não é preciso passar pelos logs com as decisões); os
+        # valores já estão em self.amounts desde load_real_data
+        n = len(self.real_events)
+        real_amounts = self.amounts
+        real_is_attack = np.empty(n, dtype=np.bool_)
+        real_services = []
+        real_channels = []
+        real_geos = []
+        for i, event in enumerate(self.real_events):
+            ctx = event['ctx']
+            real_is_attack[i] = event['is_attack']
+            real_services.append(event['tx']['service'])
+            real_channels.append(ctx['channel'])
+            real_geos.append(ctx['geo'])
+        
+        # Contagens por categoria numa passada cada (Counter)
+        n_services = len(real_services)
+        n_channels = len(real_channels)
         
         # Estatísticas de distribuição
         distribution_stats = {
             "amount": {
-                "real_mean": np.mean(real_amounts),
+                "real_mean": real_amounts.mean(),
                 "real_median": np.median(real_amounts),
-                "real_std": np.std(real_amounts),
-                "real_min": np.min(real_amounts),
-                "real_max": np.max(real_amounts),
+                "real_std": real_amounts.std(),
+                "real_min": real_amounts.min(),
+                "real_max": real_amounts.max(),
             },
             "attack_rate": {
-                "real": np.mean(real_is_attack),
+                "real": real_is_attack.mean(),
             },
             "service_distribution": {
-                service: real_services.count(service) / len(real_services)
-                for service in set(real_services)
+                service: count / n_services
+                for service, count in Counter(real_services).items()
             },
             "channel_distribution": {
-                channel: real_channels.count(channel) / len(real_channels)
-                for channel in set(real_channels)
+                channel: count / n_channels
+                for channel, count in Counter(real_channels).items()
             },
             "geo_distribution_top10": {},
         }
         
-        # Top 10 localizações
-        geo_counts = defaultdict(int)
-        for geo in real_geos:
-            geo_counts[geo] += 1
-        top_geos = sorted(geo_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        for geo, count in top_geos:
-            distribution_stats["geo_distribution_top10"][geo] = count / len(real_geos)
+        # Top 10 localizações (most_common mantém a ordem de sorted(..., reverse=True))
+        geo_counts = Counter(real_geos)
+        n_geos = len(real_geos)
+        distribution_stats["geo_distribution_top10"] = {
+            geo: count / n_geos for geo, count in geo_counts.most_common(10)
+        }
         
         print(f"\nReal Data Distribution:")
         print(f"  Amount: mean=${distribution_stats['amount']['real_mean']:.2f}, "
@@ -425,46 +464,40 @@ class EmpiricalValidator:
         
         # 1. Métricas reais
         metrics_path = output_path / "empirical_metrics.json"
-        with open(metrics_path, 'w') as f:
-            json.dump({
-                "real_metrics": self.real_metrics,
-                "simulation_metrics": self.simulation_metrics,
-            }, f, indent=2)
+        dump_json(metrics_path, {
+            "real_metrics": self.real_metrics,
+            "simulation_metrics": self.simulation_metrics,
+        })
         print(f"✓ Saved metrics: {metrics_path}")
         
-        # 2. Correlação (converte numpy types para Python types)
-        correlation_serializable = self._make_json_serializable(self.correlation)
+        # 2. Correlação (tipos NumPy são convertidos pelo próprio dump_json)
         correlation_path = output_path / "empirical_correlation.json"
-        with open(correlation_path, 'w') as f:
-            json.dump(correlation_serializable, f, indent=2)
+        dump_json(correlation_path, self.correlation)
         print(f"✓ Saved correlation: {correlation_path}")
         
         # 3. Estatísticas do dataset real
         stats_path = output_path / "empirical_dataset_stats.json"
-        with open(stats_path, 'w') as f:
-            json.dump(self.real_stats, f, indent=2)
+        dump_json(stats_path, self.real_stats)
         print(f"✓ Saved dataset stats: {stats_path}")
         
-        # 4. Logs completos (baseline e securebank) - apenas uma amostra
+        # 4. Logs completos (baseline e securebank) - apenas uma amostra,
+        # em JSON Lines (um evento compacto por linha, ver log_io)
         sample_size = min(1000, len(self.baseline_logs))
-        baseline_sample = self._make_json_serializable(self.baseline_logs[:sample_size])
-        securebank_sample = self._make_json_serializable(self.securebank_logs[:sample_size])
+        baseline_sample = self.baseline_logs[:sample_size]
+        securebank_sample = self.securebank_logs[:sample_size]
         
-        baseline_path = output_path / "empirical_baseline_logs_sample.json"
-        with open(baseline_path, 'w') as f:
-            json.dump(baseline_sample, f, indent=2)
+        baseline_path = output_path / "empirical_baseline_logs_sample.jsonl"
+        write_logs(baseline_path, baseline_sample)
         print(f"✓ Saved baseline logs sample: {baseline_path}")
         
-        securebank_path = output_path / "empirical_securebank_logs_sample.json"
-        with open(securebank_path, 'w') as f:
-            json.dump(securebank_sample, f, indent=2)
+        securebank_path = output_path / "empirical_securebank_logs_sample.jsonl"
+        write_logs(securebank_path, securebank_sample)
         print(f"✓ Saved securebank logs sample: {securebank_path}")
         
         # 5. Detecção por cenário
         scenario_detection = compute_scenario_detection(self.baseline_logs, self.securebank_logs)
         scenario_path = output_path / "empirical_scenario_detection.json"
-        with open(scenario_path, 'w') as f:
-            json.dump(scenario_detection, f, indent=2)
+        dump_json(scenario_path, scenario_detection)
         print(f"✓ Saved scenario detection: {scenario_path}")
         
         print(f"\n{'='*70}")
@@ -21,6 +21,8 @@ import statistics
 from typing import Dict, List, Tuple
 from collections import defaultdict
 
+from metrics import _BLOCKING  # decisões que não são um simples allow
+
 
 class FrameworkComparator:
     """
@@ -124,7 +126,7 @@ class FrameworkComparator:
         
         # Adiciona variação baseada em complexidade de decisão
         if logs:
-            complex_decisions = sum(1 for log in logs if log.get("action") in ["block", "step_up"])
+            complex_decisions = sum(1 for log in logs if log.get("action") in _BLOCKING)
             complexity_factor = complex_decisions / len(logs)
             base *= (1 + complexity_factor * 0.3)  # até 30% overhead em decisões complexas
         
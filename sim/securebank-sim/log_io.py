@@ -0,0 +1,89 @@
+# log_io.py
+"""
+Leitura/escrita de logs de eventos em JSON Lines (um evento por linha).
+
+Diferente de json.dump(logs, indent=2), a escrita é incremental e a
+leitura via iter_logs() é um gerador: não é preciso manter a lista
+inteira em memória (ex.: estudo de escalabilidade com 100k eventos).
+
+dump_json() grava os artefatos menores (resultados, stats, timeline)
+como JSON indentado.
+
+Usa orjson quando disponível; caso contrário, json da stdlib.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # orjson é opcional
+    orjson = None
+
+if orjson is not None:
+    # chaves int (ex.: IDs de cenário) e tipos NumPy como no json da stdlib
+    _DUMP_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    # eventos podem trazer escalares NumPy (ex.: valores lidos via pandas)
+    _LINE_OPTS = orjson.OPT_SERIALIZE_NUMPY
+
+# buffer de escrita (bytes) para o caminho da stdlib
+_WRITE_BUFFER = 1 << 20
+
+
+def write_logs(path: Union[str, Path], logs: Iterable[Dict[str, Any]]) -> int:
+    """
+    Grava os eventos em JSONL, sem indentação.
+    Retorna o número de eventos gravados.
+    """
+    n = 0
+    with open(path, "wb") as f:
+        write = f.write
+        if orjson is not None:
+            dumps = orjson.dumps
+            for log in logs:
+                write(dumps(log, option=_LINE_OPTS))
+                write(b"\n")
+                n += 1
+        else:
+            encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"),
+                                       default=_json_default)
+            for log in logs:
+                write(encoder.encode(log).encode("utf-8"))
+                write(b"\n")
+                n += 1
+    return n
+
+
+def iter_logs(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Gera os eventos de um arquivo JSONL, um por vez."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Hook default= do json da stdlib: converte escalares/arrays NumPy só
+    quando o encoder os encontra (equivalente ao OPT_SERIALIZE_NUMPY).
+    """
+    # np.generic.tolist() devolve o escalar Python; ndarray.tolist() a lista
+    tolist = getattr(obj, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_json(path: Union[str, Path], obj: Any) -> None:
+    """Grava obj como JSON indentado (2 espaços); aceita tipos NumPy."""
+    if orjson is not None:
+        # um único write com o documento inteiro já em bytes
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=_DUMP_OPTS))
+    else:
+        # json.dump emite muitos pedaços pequenos: buffer grande evita um
+        # write() por pedaço (padrão é ~8 KiB)
+        with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+            json.dump(obj, f, indent=2, default=_json_default)
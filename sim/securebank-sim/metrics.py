@@ -2,6 +2,9 @@
 from collections import defaultdict
 from statistics import mean, stdev
 
+# Ações que contam como tratamento automático (bloqueio ou step-up)
+_BLOCKING = frozenset(("block", "step_up"))
+
 
 def compute_tii(logs):
     """
@@ -47,11 +50,12 @@ def compute_tii_per_service(logs):
     total = defaultdict(int)
 
     for ev in logs:
+        get = ev.get
         s = ev["tx"].get("service")
         if not s:
             continue
         total[s] += 1
-        if ev.get("allowed") and not ev.get("is_attack", False):
+        if get("allowed") and not get("is_attack", False):
             valid[s] += 1
 
     result = {}
@@ -76,9 +80,10 @@ def compute_sae(logs):
     I_auto = 0
 
     for ev in logs:
-        if ev["is_attack"]:
+        get = ev.get
+        if get("is_attack", False):
             I_tot += 1
-            if ev.get("action") in ["block", "step_up"]:
+            if get("action", "allow") in _BLOCKING:
                 I_auto += 1
 
     return I_auto / I_tot if I_tot > 0 else 0.0
@@ -104,15 +109,23 @@ def compute_ital(logs, ital_params=None):
     if not logs:
         return 0.0
 
-    # --- 1) Drift de trust por usuário ---
-    last_trust = {}
+    # --- 1) Drift de trust por usuário e 2) eficácia em ataques ---
+    # Uma única passada: drift médio global + fração de ataques bloqueados.
     total_drift = 0.0
     drift_count = 0
+    total_attacks = 0
+    blocked_attacks = 0
 
     for log in logs:
-        uid = log.get("tx", {}).get("user_id")
-        trust_before = log.get("I_u")
-        trust_after = log.get("new_I")
+        get = log.get
+        if get("is_attack", False):
+            total_attacks += 1
+            if get("action", "allow") == "block":
+                blocked_attacks += 1
+
+        uid = get("tx", {}).get("user_id")
+        trust_before = get("I_u")
+        trust_after = get("new_I")
 
         if uid is None or trust_before is None or trust_after is None:
             continue
@@ -122,20 +135,8 @@ def compute_ital(logs, ital_params=None):
         total_drift += diff
         drift_count += 1
 
-        last_trust[uid] = trust_after
-
     avg_drift = (total_drift / drift_count) if drift_count > 0 else 0.0
 
-    # --- 2) Fator de eficácia em ataques (ataques bloqueados) ---
-    total_attacks = 0
-    blocked_attacks = 0
-
-    for log in logs:
-        if log.get("is_attack"):
-            total_attacks += 1
-            if log.get("action") == "block":
-                blocked_attacks += 1
-
     if total_attacks > 0:
         attack_factor = blocked_attacks / total_attacks
     else:
@@ -146,6 +147,94 @@ def compute_ital(logs, ital_params=None):
     return ital
 
 
+def compute_all_metrics(logs, ital_params=None):
+    """
+    Calcula TII, SAE e ITAL numa única passada sobre os logs.
+
+    Equivalente a chamar compute_tii, compute_sae e compute_ital
+    separadamente, mas cada evento é visitado (e cada campo lido) uma vez.
+    Como só há uma passada, logs pode ser qualquer iterável de eventos
+    (ex.: log_io.iter_logs lendo um arquivo JSONL em streaming).
+
+    Retorna um dict:
+        {"TII": x, "SAE": y, "ITAL": z}
+    """
+    if ital_params is None:
+        ital_params = {}
+
+    drift_weight = ital_params.get("identity_drift_factor", 0.6)
+
+    service_weights = {
+        "payments": 1.0,
+        "settlement": 1.2,
+        "risk_analytics": 0.8,
+        "aml": 1.1,
+        "customer_identity": 0.9,
+    }
+
+    # TII
+    valid = defaultdict(int)
+    total = defaultdict(int)
+
+    # SAE
+    I_tot = 0
+    I_auto = 0
+
+    # ITAL
+    total_drift = 0.0
+    drift_count = 0
+    blocked_attacks = 0
+
+    n_events = 0
+    for ev in logs:
+        n_events += 1
+        get = ev.get
+        tx = get("tx", {})
+        service = tx.get("service")
+        is_attack = get("is_attack")
+        action = get("action")
+        allowed = get("allowed")
+        uid = tx.get("user_id")
+        I_u = get("I_u")
+        new_I = get("new_I")
+
+        if service is not None:
+            total[service] += 1
+            if allowed and not is_attack:
+                valid[service] += 1
+
+        if is_attack:
+            I_tot += 1
+            if action == "block":
+                I_auto += 1
+                blocked_attacks += 1
+            elif action == "step_up":
+                I_auto += 1
+
+        if uid is not None and I_u is not None and new_I is not None:
+            total_drift += abs(new_I - I_u)
+            drift_count += 1
+
+    num = 0.0
+    den = 0.0
+    for s in total:
+        w = service_weights.get(s, 1.0)
+        num += w * valid[s]
+        den += w * total[s]
+    tii = num / den if den > 0 else 0.0
+
+    sae = I_auto / I_tot if I_tot > 0 else 0.0
+
+    if n_events:
+        avg_drift = (total_drift / drift_count) if drift_count > 0 else 0.0
+        attack_factor = (blocked_attacks / I_tot) if I_tot > 0 else 0.0
+        ital = drift_weight * avg_drift + (1.0 - drift_weight) * attack_factor
+    else:
+        ital = 0.0
+
+    return {"TII": tii, "SAE": sae, "ITAL": ital}
+
+
 def compute_scenario_detection(baseline_logs, securebank_logs):
     """
     Compara baseline x SecureBank por cenário de ataque.
@@ -248,31 +337,32 @@ def compute_stats(logs):
     scenarios = defaultdict(int)
 
     for ev in logs:
-        tx = ev.get("tx", {})
+        get = ev.get
+        tx = get("tx", {})
         amount = tx.get("amount")
         if amount is not None:
             amounts.append(amount)
 
-        r = ev.get("risk")
+        r = get("risk")
         if r is not None:
             risks.append(r)
 
-        th = ev.get("theta")
+        th = get("theta")
         if th is not None:
             thetas.append(th)
 
-        I_u = ev.get("I_u")
-        new_I = ev.get("new_I")
+        I_u = get("I_u")
+        new_I = get("new_I")
         if I_u is not None:
             trust_before.append(I_u)
         if new_I is not None:
             trust_after.append(new_I)
 
-        act = ev.get("action")
+        act = get("action")
         if act is not None:
             actions[act] += 1
 
-        sc = ev.get("scenario")
+        sc = get("scenario")
         if sc is not None:
             scenarios[sc] += 1
 
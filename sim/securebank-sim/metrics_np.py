@@ -0,0 +1,407 @@
+# metrics_np.py
+"""
+Versões vetorizadas (NumPy) das métricas do SecureBank™.
+
+Os logs (lista de dicts) são convertidos uma única vez para arrays
+colunares (struct-of-arrays) por logs_to_arrays(); a partir daí cada
+métrica é uma redução com máscaras booleanas, sem laço Python por evento.
+
+Os resultados são equivalentes aos de metrics.py / advanced_metrics.py.
+
+Se o numba estiver instalado, compute_all_metrics usa um kernel compilado
+(_reduce_events) que faz todas as contagens numa única passada, sem
+alocar máscaras temporárias; caso contrário cai no caminho NumPy puro.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # numba é opcional
+    njit = None
+
+
+# allow < step_up < block: "bloqueado ou step-up" vira action_code >= 1
+ACTION_CODES = {"allow": 0, "step_up": 1, "block": 2}
+
+# Cache das conversões logs -> arrays, por id(logs). A mesma lista costuma
+# passar por várias métricas (ROI, matriz de confusão, FP/FN, TII/SAE/ITAL);
+# a entrada guarda a própria lista para validar identidade e tamanho, já que
+# id() pode ser reutilizado após o objeto ser coletado. Eventos alterados
+# in-place (mesmo tamanho) não são detectados: use clear_arrays_cache().
+_ARRAYS_CACHE_MAXSIZE = 8
+_arrays_cache: "OrderedDict[int, Tuple[list, int, Dict[str, Any]]]" = OrderedDict()
+_arrays_cache_stats = {"hits": 0, "misses": 0}
+
+# Layout de um evento no produtor colunar (simulator.run_simulation_columnar)
+LOG_DTYPE = np.dtype([
+    ("is_attack", np.bool_),
+    ("allowed", np.bool_),
+    ("action", np.uint8),
+    ("service", np.int16),
+    ("user_id", np.int32),
+    ("I_u", np.float64),
+    ("new_I", np.float64),
+])
+
+SERVICE_WEIGHTS = {
+    "payments": 1.0,
+    "settlement": 1.2,
+    "risk_analytics": 0.8,
+    "aml": 1.1,
+    "customer_identity": 0.9,
+}
+
+
+def logs_to_arrays(logs: Iterable[Dict]) -> Dict[str, Any]:
+    """
+    Converte logs em arrays NumPy (uma passada sobre os eventos).
+    Aceita qualquer iterável, inclusive o gerador log_io.iter_logs.
+
+    Campos:
+      - is_attack, allowed : bool
+      - action_code        : uint8 (ACTION_CODES; ausente/desconhecida = allow)
+      - service_code       : int32 indexando "service_names" (-1 = sem serviço)
+      - user_code          : int32 (-1 = sem user_id)
+      - I_u, new_I         : float64 (NaN quando ausentes, ex.: baseline)
+    """
+    action_codes = ACTION_CODES
+    services: Dict[Any, int] = {}
+    users: Dict[Any, int] = {}
+
+    is_attack = []
+    allowed = []
+    action_code = []
+    service_code = []
+    user_code = []
+    I_u = []
+    new_I = []
+
+    nan = float("nan")
+
+    for ev in logs:
+        get = ev.get
+        tx = get("tx", {})
+        s = tx.get("service")
+        uid = tx.get("user_id")
+        i_before = get("I_u")
+        i_after = get("new_I")
+
+        is_attack.append(bool(get("is_attack")))
+        allowed.append(bool(get("allowed")))
+        action_code.append(action_codes.get(get("action"), 0))
+        service_code.append(-1 if s is None else services.setdefault(s, len(services)))
+        user_code.append(-1 if uid is None else users.setdefault(uid, len(users)))
+        I_u.append(nan if i_before is None else i_before)
+        new_I.append(nan if i_after is None else i_after)
+
+    return {
+        "n": len(is_attack),
+        "is_attack": np.array(is_attack, dtype=np.bool_),
+        "allowed": np.array(allowed, dtype=np.bool_),
+        "action_code": np.array(action_code, dtype=np.uint8),
+        "service_code": np.array(service_code, dtype=np.int32),
+        "service_names": list(services),
+        "user_code": np.array(user_code, dtype=np.int32),
+        "num_users": len(users),
+        "I_u": np.array(I_u, dtype=np.float64),
+        "new_I": np.array(new_I, dtype=np.float64),
+    }
+
+
+def records_to_arrays(rec: np.ndarray, service_names: List[str], num_users: int) -> Dict[str, Any]:
+    """
+    Converte um array estruturado (LOG_DTYPE) no formato de logs_to_arrays.
+
+    service / user_id já são códigos: índices em service_names e IDs
+    inteiros de usuário (0..num_users-1).
+    """
+    return {
+        "n": len(rec),
+        "is_attack": np.ascontiguousarray(rec["is_attack"]),
+        "allowed": np.ascontiguousarray(rec["allowed"]),
+        "action_code": np.ascontiguousarray(rec["action"]),
+        "service_code": rec["service"].astype(np.int32),
+        "service_names": list(service_names),
+        "user_code": np.ascontiguousarray(rec["user_id"]),
+        "num_users": num_users,
+        "I_u": np.ascontiguousarray(rec["I_u"]),
+        "new_I": np.ascontiguousarray(rec["new_I"]),
+    }
+
+
+def _weights_for(service_names: List[str], service_weights: Dict[str, float] = None) -> np.ndarray:
+    """Pesos alinhados ao codebook de serviços (service_code -> peso)."""
+    if service_weights is None:
+        service_weights = SERVICE_WEIGHTS
+    return np.fromiter(
+        (service_weights.get(s, 1.0) for s in service_names),
+        dtype=np.float64,
+        count=len(service_names),
+    )
+
+
+def _as_arrays(logs_or_arrays) -> Dict[str, Any]:
+    """
+    Aceita tanto logs (lista de dicts) quanto o retorno de logs_to_arrays.
+    Listas já convertidas recentemente são servidas do cache.
+    """
+    if isinstance(logs_or_arrays, dict) and "action_code" in logs_or_arrays:
+        return logs_or_arrays
+    if not isinstance(logs_or_arrays, list):
+        # iteráveis (ex.: geradores) só podem ser consumidos uma vez
+        return logs_to_arrays(logs_or_arrays)
+
+    key = id(logs_or_arrays)
+    entry = _arrays_cache.get(key)
+    if entry is not None and entry[0] is logs_or_arrays and entry[1] == len(logs_or_arrays):
+        _arrays_cache.move_to_end(key)
+        _arrays_cache_stats["hits"] += 1
+        return entry[2]
+
+    _arrays_cache_stats["misses"] += 1
+    arrays = logs_to_arrays(logs_or_arrays)
+    _arrays_cache[key] = (logs_or_arrays, len(logs_or_arrays), arrays)
+    _arrays_cache.move_to_end(key)
+    while len(_arrays_cache) > _ARRAYS_CACHE_MAXSIZE:
+        _arrays_cache.popitem(last=False)
+    return arrays
+
+
+def arrays_cache_info() -> Dict[str, int]:
+    """Estatísticas do cache de conversões (hits, misses, entradas)."""
+    return {**_arrays_cache_stats, "size": len(_arrays_cache)}
+
+
+def clear_arrays_cache() -> None:
+    """Esvazia o cache de conversões e zera as estatísticas."""
+    _arrays_cache.clear()
+    _arrays_cache_stats["hits"] = 0
+    _arrays_cache_stats["misses"] = 0
+
+
+def logs_digest(logs_or_arrays, fields: Tuple[str, ...] = ("is_attack", "action_code")) -> str:
+    """
+    Digest (blake2b) do conteúdo das colunas indicadas. Serve de chave
+    exata para memoizar resultados que dependem só dessas colunas
+    (ex.: matriz de confusão usa is_attack e action_code).
+    """
+    a = _as_arrays(logs_or_arrays)
+    h = hashlib.blake2b(digest_size=16)
+    for f in fields:
+        h.update(a[f].tobytes())
+    return h.hexdigest()
+
+
+def _attack_actions(a: Dict[str, Any]) -> np.ndarray:
+    """action_code apenas dos eventos de ataque (array contíguo e menor)."""
+    return a["action_code"][a["is_attack"]]
+
+
+def _trust_drift(a: Dict[str, Any]) -> np.ndarray:
+    """
+    |new_I - I_u| dos eventos com user_id e trust antes/depois.
+
+    Uma subtração float64 (o NaN de campos ausentes se propaga) e abs
+    in-place; basta um isnan sobre a diferença em vez de um por coluna.
+    """
+    d = np.subtract(a["new_I"], a["I_u"])
+    np.abs(d, out=d)
+    return d[(a["user_code"] >= 0) & ~np.isnan(d)]
+
+
+def compute_tii(logs_or_arrays, service_weights: Dict[str, float] = None) -> float:
+    """TII vetorizado (ver metrics.compute_tii)."""
+    a = _as_arrays(logs_or_arrays)
+    names = a["service_names"]
+    sc = a["service_code"]
+    has_service = sc >= 0
+    sc = sc[has_service]
+    valid = (a["allowed"] & ~a["is_attack"])[has_service]
+
+    total_bc = np.bincount(sc, minlength=len(names))
+    valid_bc = np.bincount(sc, weights=valid.astype(np.float64), minlength=len(names))
+
+    w = _weights_for(names, service_weights)
+    num = w @ valid_bc
+    den = w @ total_bc
+
+    return float(num / den) if den > 0 else 0.0
+
+
+def compute_tii_per_service(logs_or_arrays) -> Dict[str, Dict[str, Any]]:
+    """TII por serviço, não ponderado (ver metrics.compute_tii_per_service)."""
+    a = _as_arrays(logs_or_arrays)
+    names = a["service_names"]
+    sc = a["service_code"]
+    has_service = sc >= 0
+    sc = sc[has_service]
+    valid = (a["allowed"] & ~a["is_attack"])[has_service]
+
+    total_bc = np.bincount(sc, minlength=len(names))
+    valid_bc = np.bincount(sc[valid], minlength=len(names))
+
+    result = {}
+    for k, s in enumerate(names):
+        if not s:
+            continue
+        v = int(valid_bc[k])
+        t = int(total_bc[k])
+        if t == 0:
+            # codebook fixo (produtor colunar): serviço sem eventos
+            continue
+        result[s] = {"valid": v, "total": t, "tii": (v / t) if t > 0 else 0.0}
+    return result
+
+
+def compute_sae(logs_or_arrays) -> float:
+    """SAE vetorizado (ver metrics.compute_sae)."""
+    a = _as_arrays(logs_or_arrays)
+    atk = _attack_actions(a)
+    I_tot = atk.size
+    I_auto = np.count_nonzero(atk >= 1)
+    return I_auto / I_tot if I_tot > 0 else 0.0
+
+
+def compute_ital(logs_or_arrays, ital_params: Dict[str, Any] = None) -> float:
+    """ITAL vetorizado (ver metrics.compute_ital)."""
+    a = _as_arrays(logs_or_arrays)
+    if ital_params is None:
+        ital_params = {}
+    drift_weight = ital_params.get("identity_drift_factor", 0.6)
+
+    if a["n"] == 0:
+        return 0.0
+
+    drift = _trust_drift(a)
+    avg_drift = float(drift.mean()) if drift.size > 0 else 0.0
+
+    atk = _attack_actions(a)
+    total_attacks = atk.size
+    blocked_attacks = np.count_nonzero(atk == ACTION_CODES["block"])
+    attack_factor = blocked_attacks / total_attacks if total_attacks > 0 else 0.0
+
+    return drift_weight * avg_drift + (1.0 - drift_weight) * attack_factor
+
+
+def _reduce_events_py(is_attack, allowed, action_code, service_code, user_code,
+                      I_u, new_I, num_services):
+    """
+    Redutor fundido: contagens por serviço (TII), contadores de ataque
+    (SAE/ITAL) e soma do drift de trust (ITAL) numa única passada.
+
+    Escrito só com arrays e escalares para ser compilável pelo numba.
+    """
+    valid = np.zeros(num_services, dtype=np.float64)
+    total = np.zeros(num_services, dtype=np.float64)
+    total_attacks = 0
+    auto_attacks = 0
+    blocked_attacks = 0
+    drift_sum = 0.0
+    drift_count = 0
+
+    for i in range(is_attack.shape[0]):
+        atk = is_attack[i]
+
+        s = service_code[i]
+        if s >= 0:
+            total[s] += 1.0
+            if allowed[i] and not atk:
+                valid[s] += 1.0
+
+        if atk:
+            total_attacks += 1
+            c = action_code[i]
+            if c >= 1:
+                auto_attacks += 1
+            if c == 2:
+                blocked_attacks += 1
+
+        if user_code[i] >= 0:
+            d = new_I[i] - I_u[i]
+            if d == d:  # falso quando I_u ou new_I é NaN (ausente)
+                drift_sum += abs(d)
+                drift_count += 1
+
+    return valid, total, total_attacks, auto_attacks, blocked_attacks, drift_sum, drift_count
+
+
+# Assinatura explícita (tipos de LOG_DTYPE / logs_to_arrays): compila, ou
+# carrega do cache em disco, na importação em vez de na primeira chamada.
+_REDUCE_EVENTS_SIG = ("(boolean[::1], boolean[::1], uint8[::1], int32[::1], int32[::1], "
+                      "float64[::1], float64[::1], int64)")
+
+# Sem fastmath: o sentinela NaN de I_u/new_I precisa ser respeitado.
+_reduce_events = njit(_REDUCE_EVENTS_SIG, cache=True)(_reduce_events_py) if njit is not None else None
+
+
+def _reduce_events_np(a: Dict[str, Any]) -> Tuple:
+    """Mesmo resultado de _reduce_events, com máscaras NumPy."""
+    num_services = len(a["service_names"])
+    is_attack = a["is_attack"]
+    action_code = a["action_code"]
+    sc = a["service_code"]
+    has_service = sc >= 0
+
+    total = np.bincount(sc[has_service], minlength=num_services).astype(np.float64)
+    valid_mask = (a["allowed"] & ~is_attack)[has_service]
+    valid = np.bincount(sc[has_service][valid_mask], minlength=num_services).astype(np.float64)
+
+    atk = action_code[is_attack]
+    total_attacks = int(atk.size)
+    auto_attacks = int(np.count_nonzero(atk >= 1))
+    blocked_attacks = int(np.count_nonzero(atk == ACTION_CODES["block"]))
+
+    drift = _trust_drift(a)
+
+    return valid, total, total_attacks, auto_attacks, blocked_attacks, float(drift.sum()), int(drift.size)
+
+
+def compute_all_metrics(logs_or_arrays, ital_params: Dict[str, Any] = None) -> Dict[str, float]:
+    """TII, SAE e ITAL a partir de uma única conversão para arrays."""
+    a = _as_arrays(logs_or_arrays)
+    if ital_params is None:
+        ital_params = {}
+    drift_weight = ital_params.get("identity_drift_factor", 0.6)
+
+    if _reduce_events is not None:
+        reduced = _reduce_events(
+            a["is_attack"], a["allowed"], a["action_code"], a["service_code"],
+            a["user_code"], a["I_u"], a["new_I"], len(a["service_names"]),
+        )
+    else:
+        reduced = _reduce_events_np(a)
+    valid, total, total_attacks, auto_attacks, blocked_attacks, drift_sum, drift_count = reduced
+
+    w = _weights_for(a["service_names"])
+    num = w @ valid
+    den = w @ total
+    tii = float(num / den) if den > 0 else 0.0
+
+    sae = auto_attacks / total_attacks if total_attacks > 0 else 0.0
+
+    if a["n"] == 0:
+        ital = 0.0
+    else:
+        avg_drift = drift_sum / drift_count if drift_count > 0 else 0.0
+        attack_factor = blocked_attacks / total_attacks if total_attacks > 0 else 0.0
+        ital = drift_weight * avg_drift + (1.0 - drift_weight) * attack_factor
+
+    return {"TII": tii, "SAE": sae, "ITAL": ital}
+
+
+def compute_confusion_matrix(logs_or_arrays) -> Dict[str, int]:
+    """Matriz de confusão vetorizada (ver advanced_metrics.compute_confusion_matrix)."""
+    a = _as_arrays(logs_or_arrays)
+    is_attack = a["is_attack"].view(np.uint8)
+    blocked = (a["action_code"] >= 1).view(np.uint8)
+
+    # código 2 bits (ataque, bloqueado): 0=TN, 1=FP, 2=FN, 3=TP
+    codes = (is_attack << 1) | blocked
+    tn, fp, fn, tp = np.bincount(codes, minlength=4).tolist()
+
+    return {"TP": tp, "TN": tn, "FP": fp, "FN": fn}
@@ -11,6 +11,8 @@ Referência: https://attack.mitre.org/
 from typing import Dict, List, Set
 from collections import defaultdict
 
+from metrics import _BLOCKING  # ações que contam como detecção do ataque
+
 
 # Mapeamento completo: cenário -> técnicas MITRE ATT&CK
 SCENARIO_TO_MITRE = {
@@ -198,7 +200,7 @@ class MITREAttackMapper:
                 continue
             
             action = log.get("action")
-            detected = action in ["block", "step_up"]
+            detected = action in _BLOCKING
             blocked = action == "block"
             
             # Atualiza estatísticas do cenário
@@ -0,0 +1,379 @@
+# pdp_np.py
+"""
+Versões colunares dos PDPs baseline e SecureBank™ (simulator.baseline_pdp e
+simulator.securebank_pdp), para rodar sobre uma sequência de eventos já
+conhecida (ex.: os dados reais da validação empírica).
+
+events_to_arrays() converte os eventos uma única vez para arrays
+(struct-of-arrays): usuário e dispositivo viram códigos inteiros e
+geo/canal/serviço viram as flags que as regras consultam. run_pdps()
+executa as duas políticas: o baseline não tem estado, então é uma expressão
+vetorizada (baseline_actions); o SecureBank depende dos eventos anteriores e
+roda num laço sequencial, com a confiança (I, D) e o perfil de gasto em
+arrays indexados por esses códigos.
+
+As decisões continuam colunares: metrics_arrays() as entrega no formato de
+metrics_np.logs_to_arrays, e MergedLogs expõe os logs {**event, **decision}
+como sequência, montando cada dict só quando acessado.
+
+O kernel (run_pdps_kernel) é compilado se o numba estiver instalado; sem
+ele run_pdps roda a mesma função em Python, o que é correto mas mais lento
+que chamar os PDPs de simulator.py evento a evento. As operações em float64
+seguem a mesma ordem das funções originais, então decisões e valores são
+idênticos.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from metrics_np import ACTION_CODES
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # numba é opcional
+    njit = None
+
+
+# Nome da ação por código (inverso de metrics_np.ACTION_CODES)
+ACTION_NAMES = tuple(sorted(ACTION_CODES, key=ACTION_CODES.get))
+_ACTION_NAMES_ARRAY = np.array(ACTION_NAMES, dtype=object)
+
+# Conjuntos usados pelas regras de simulator.py
+_BASELINE_RISKY_GEOS = frozenset(("RU", "CN", "NG"))
+_SECUREBANK_KNOWN_GEOS = frozenset(("US-FL", "US-NY", "US-CA", "BR-SP"))
+_SENSITIVE_SERVICES = frozenset(("settlement", "aml"))
+
+
+def events_to_arrays(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Converte eventos (formato de simulator / real_data_adapter) em arrays.
+
+    Campos:
+      - amount, base_risk         : float64 (base_risk ausente = 0.2)
+      - hour                      : int32
+      - user_code, device_code    : int32 (códigos 0..num_users-1 / num_devices-1)
+      - risky_geo                 : bool, geo em RU/CN/NG (baseline)
+      - unknown_geo               : bool, geo fora das regiões conhecidas (SecureBank)
+      - api_channel               : bool, canal "api"
+      - sensitive_service         : bool, serviço settlement/aml
+      - is_attack                 : bool
+      - service_code              : int32 indexando "service_names" (-1 = sem serviço)
+    """
+    n = len(events)
+    amount = np.empty(n, dtype=np.float64)
+    base_risk = np.empty(n, dtype=np.float64)
+    hour = np.empty(n, dtype=np.int32)
+    user_code = np.empty(n, dtype=np.int32)
+    device_code = np.empty(n, dtype=np.int32)
+    risky_geo = np.empty(n, dtype=np.bool_)
+    unknown_geo = np.empty(n, dtype=np.bool_)
+    api_channel = np.empty(n, dtype=np.bool_)
+    sensitive_service = np.empty(n, dtype=np.bool_)
+    is_attack = np.empty(n, dtype=np.bool_)
+    service_code = np.empty(n, dtype=np.int32)
+
+    services: Dict[Any, int] = {}
+    users: Dict[Any, int] = {}
+    devices: Dict[Any, int] = {}
+    # flags por geo, calculadas uma vez por valor distinto
+    geo_flags: Dict[Any, tuple] = {}
+
+    for i, event in enumerate(events):
+        user = event["user"]
+        tx = event["tx"]
+        ctx = event["ctx"]
+        geo = ctx["geo"]
+
+        flags = geo_flags.get(geo)
+        if flags is None:
+            flags = geo_flags[geo] = (geo in _BASELINE_RISKY_GEOS,
+                                      geo not in _SECUREBANK_KNOWN_GEOS)
+
+        amount[i] = tx["amount"]
+        base_risk[i] = user.get("base_risk", 0.2)
+        hour[i] = ctx["hour"]
+        user_code[i] = users.setdefault(user["id"], len(users))
+        device_code[i] = devices.setdefault(event["device"]["id"], len(devices))
+        risky_geo[i], unknown_geo[i] = flags
+        api_channel[i] = ctx["channel"] == "api"
+        service = tx["service"]
+        sensitive_service[i] = service in _SENSITIVE_SERVICES
+        service_code[i] = -1 if service is None else services.setdefault(service, len(services))
+        is_attack[i] = bool(event.get("is_attack"))
+
+    return {
+        "n": n,
+        "amount": amount,
+        "base_risk": base_risk,
+        "hour": hour,
+        "user_code": user_code,
+        "num_users": len(users),
+        "device_code": device_code,
+        "num_devices": len(devices),
+        "risky_geo": risky_geo,
+        "unknown_geo": unknown_geo,
+        "api_channel": api_channel,
+        "sensitive_service": sensitive_service,
+        "is_attack": is_attack,
+        "service_code": service_code,
+        "service_names": list(services),
+    }
+
+
+def baseline_actions(amount: np.ndarray, risky_geo: np.ndarray) -> np.ndarray:
+    """
+    baseline_pdp para todos os eventos (códigos ACTION_CODES).
+
+    As regras só olham o próprio evento, então não há laço: o resultado
+    independe da ordem e sai de duas comparações vetorizadas.
+    """
+    action = np.zeros(amount.shape[0], dtype=np.uint8)
+    action[risky_geo & (amount > 2000)] = ACTION_CODES["block"]
+    # step-up tem precedência (primeira regra de baseline_pdp)
+    action[amount > 20000] = ACTION_CODES["step_up"]
+    return action
+
+
+def _run_pdps_py(amount, base_risk, hour, user_code, device_code,
+                 unknown_geo, api_channel, sensitive_service, num_users,
+                 num_devices, trust_decay, trust_growth, identity_drift_factor):
+    """
+    securebank_pdp para todos os eventos, em ordem (o estado de confiança
+    e o perfil de gasto de cada evento dependem dos anteriores).
+
+    Escrito só com arrays e escalares para ser compilável pelo numba.
+    Ações seguem ACTION_CODES (0=allow, 1=step_up, 2=block).
+    """
+    n = amount.shape[0]
+    sb_action = np.zeros(n, dtype=np.uint8)
+    theta_out = np.empty(n, dtype=np.float64)
+    risk_out = np.empty(n, dtype=np.float64)
+    I_u_out = np.empty(n, dtype=np.float64)
+    D_d_out = np.empty(n, dtype=np.float64)
+    new_I_out = np.empty(n, dtype=np.float64)
+    new_D_out = np.empty(n, dtype=np.float64)
+    drift_out = np.empty(n, dtype=np.float64)
+
+    # estado do SecureBank: confiança inicial 0.9, perfil vazio (count 0)
+    trust_I = np.full(num_users, 0.9)
+    trust_D = np.full(num_devices, 0.9)
+    prof_avg = np.zeros(num_users, dtype=np.float64)
+    prof_count = np.zeros(num_users, dtype=np.int64)
+
+    for i in range(n):
+        amt = amount[i]
+        u = user_code[i]
+        d = device_code[i]
+
+        I_u = trust_I[u]
+        D_d = trust_D[d]
+
+        risk = 0.0
+        if amt > 3_000:
+            risk += 0.15
+        if amt > 7_500:
+            risk += 0.15
+        if amt > 15_000:
+            risk += 0.20
+        if amt > 40_000:
+            risk += 0.20
+        if unknown_geo[i]:
+            risk += 0.25
+        h = hour[i]
+        if h < 6 or h > 22:
+            risk += 0.20
+        if api_channel[i]:
+            risk += 0.15
+        if sensitive_service[i] and amt > 5_000:
+            risk += 0.30
+
+        drift_risk = 0.0
+        count = prof_count[u]
+        if count == 0:
+            prof_avg[u] = amt
+            prof_count[u] = 1
+        else:
+            avg_amt = prof_avg[u]
+            denom = max(avg_amt, 1e-6)
+            drift_ratio = abs(amt - avg_amt) / denom
+            drift_risk = min(1.0, drift_ratio * identity_drift_factor)
+            risk += drift_risk
+            new_count = count + 1
+            prof_avg[u] = avg_amt + (amt - avg_amt) / new_count
+            prof_count[u] = new_count
+
+        risk += 0.20 * base_risk[i]
+        risk = max(0.0, min(1.0, risk))
+
+        theta = 0.5 * I_u + 0.5 * D_d - 0.30 * risk
+        theta = max(0.0, min(1.0, theta))
+
+        if theta < 0.20:
+            sb_action[i] = 2
+        elif theta < 0.55:
+            sb_action[i] = 1
+
+        if risk > 0.55:
+            new_I = max(0.0, I_u * (1 - trust_decay))
+            new_D = max(0.0, D_d * (1 - trust_decay * 0.8))
+        else:
+            target = 0.95
+            new_I = min(target, I_u + trust_growth * (target - I_u))
+            new_D = min(target, D_d + trust_growth * (target - D_d))
+
+        trust_I[u] = new_I
+        trust_D[d] = new_D
+
+        theta_out[i] = theta
+        risk_out[i] = risk
+        I_u_out[i] = I_u
+        D_d_out[i] = D_d
+        new_I_out[i] = new_I
+        new_D_out[i] = new_D
+        drift_out[i] = drift_risk
+
+    return (sb_action, theta_out, risk_out, I_u_out, D_d_out,
+            new_I_out, new_D_out, drift_out)
+
+
+# Assinatura explícita (tipos de events_to_arrays): compila, ou carrega do
+# cache em disco, na importação em vez de na primeira chamada.
+_RUN_PDPS_SIG = ("(float64[::1], float64[::1], int32[::1], int32[::1], int32[::1], "
+                 "boolean[::1], boolean[::1], boolean[::1], int64, int64, "
+                 "float64, float64, float64)")
+
+# Sem fastmath: os resultados precisam bater com simulator.py bit a bit.
+run_pdps_kernel = njit(_RUN_PDPS_SIG, cache=True)(_run_pdps_py) if njit is not None else None
+
+
+def run_pdps(arrays: Dict[str, Any], ital_params: Dict[str, Any] = None) -> Dict[str, np.ndarray]:
+    """
+    Executa baseline e SecureBank sobre os arrays de events_to_arrays.
+    Usa o kernel compilado quando disponível (ver run_pdps_kernel).
+
+    Retorna arrays alinhados aos eventos: base_action e action (códigos
+    ACTION_CODES) e os campos numéricos da decisão do SecureBank (theta,
+    risk, I_u, D_d, new_I, new_D, drift_risk, base_risk_component).
+    """
+    if ital_params is None:
+        ital_params = {}
+    kernel = run_pdps_kernel if run_pdps_kernel is not None else _run_pdps_py
+
+    a = arrays
+    (sb_action, theta, risk, I_u, D_d,
+     new_I, new_D, drift_risk) = kernel(
+        a["amount"], a["base_risk"], a["hour"], a["user_code"], a["device_code"],
+        a["unknown_geo"], a["api_channel"], a["sensitive_service"],
+        a["num_users"], a["num_devices"],
+        float(ital_params.get("trust_decay", 0.12)),
+        float(ital_params.get("trust_growth", 0.20)),
+        float(ital_params.get("identity_drift_factor", 0.30)),
+    )
+
+    return {
+        "base_action": baseline_actions(a["amount"], a["risky_geo"]),
+        "action": sb_action,
+        "theta": theta,
+        "risk": risk,
+        "I_u": I_u,
+        "D_d": D_d,
+        "new_I": new_I,
+        "new_D": new_D,
+        "drift_risk": drift_risk,
+        "base_risk_component": 0.20 * a["base_risk"],
+    }
+
+
+def metrics_arrays(arrays: Dict[str, Any], decisions: Dict[str, np.ndarray]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    (baseline, securebank) no formato de metrics_np.logs_to_arrays, direto
+    dos arrays de eventos e de decisão (sem passar por dicts).
+    """
+    common = {
+        "n": arrays["n"],
+        "is_attack": arrays["is_attack"],
+        "service_code": arrays["service_code"],
+        "service_names": arrays["service_names"],
+        "user_code": arrays["user_code"],
+        "num_users": arrays["num_users"],
+    }
+    missing = np.full(arrays["n"], np.nan)  # baseline não registra I_u/new_I
+    baseline = {
+        **common,
+        "allowed": decisions["base_action"] == ACTION_CODES["allow"],
+        "action_code": decisions["base_action"],
+        "I_u": missing,
+        "new_I": missing,
+    }
+    securebank = {
+        **common,
+        "allowed": decisions["action"] == ACTION_CODES["allow"],
+        "action_code": decisions["action"],
+        "I_u": decisions["I_u"],
+        "new_I": decisions["new_I"],
+    }
+    return baseline, securebank
+
+
+class MergedLogs(Sequence):
+    """
+    Logs {**event, **decision} sem materializar a lista: cada acesso (índice,
+    fatia ou iteração) monta os dicts a partir dos eventos e das colunas de
+    decisão. Os dicts devolvidos são novos a cada acesso.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]], columns: Dict[str, np.ndarray]):
+        # columns: campo da decisão -> array alinhado aos eventos (ordem das chaves)
+        self._events = events
+        self._names = tuple(columns)
+        self._columns = tuple(columns.values())
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            events = self._events[index]
+            values = zip(*(c[index].tolist() for c in self._columns))
+            return [self._merge(event, row) for event, row in zip(events, values)]
+        event = self._events[index]
+        return self._merge(event, [c.item(index) for c in self._columns])
+
+    def __iter__(self):
+        # tolist() converte cada coluna de uma vez para escalares Python
+        values = zip(*(c.tolist() for c in self._columns))
+        for event, row in zip(self._events, values):
+            yield self._merge(event, row)
+
+    def _merge(self, event, row) -> Dict[str, Any]:
+        log = dict(event)
+        log.update(zip(self._names, row))
+        return log
+
+
+def merged_logs(events: List[Dict[str, Any]], decisions: Dict[str, np.ndarray]) -> Tuple[MergedLogs, MergedLogs]:
+    """
+    (baseline_logs, securebank_logs) como MergedLogs, com as mesmas chaves
+    (e na mesma ordem) das decisões de simulator.baseline_pdp/securebank_pdp.
+    """
+    base_action = decisions["base_action"]
+    sb_action = decisions["action"]
+    baseline = MergedLogs(events, {
+        "allowed": base_action == ACTION_CODES["allow"],
+        "action": _ACTION_NAMES_ARRAY[base_action],
+    })
+    securebank = MergedLogs(events, {
+        "allowed": sb_action == ACTION_CODES["allow"],
+        "action": _ACTION_NAMES_ARRAY[sb_action],
+        "theta": decisions["theta"],
+        "risk": decisions["risk"],
+        "I_u": decisions["I_u"],
+        "D_d": decisions["D_d"],
+        "new_I": decisions["new_I"],
+        "new_D": decisions["new_D"],
+        "drift_risk": decisions["drift_risk"],
+        "base_risk_component": decisions["base_risk_component"],
+    })
+    return baseline, securebank
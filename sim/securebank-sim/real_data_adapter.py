@@ -27,7 +27,7 @@ class RealDataAdapter:
         Inicializa o adaptador.
         
         Args:
-            dataset_path: Caminho para o dataset real (CSV ou JSON)
+            dataset_path: Caminho para o dataset real (CSV, JSON ou JSONL)
         """
         self.dataset_path = dataset_path
         self.df = None
@@ -40,7 +40,7 @@ class RealDataAdapter:
         Carrega dataset real de transações bancárias.
         
         Args:
-            dataset_path: Caminho para o arquivo (CSV ou JSON)
+            dataset_path: Caminho para o arquivo (CSV, JSON ou JSONL)
             
         Returns:
             DataFrame com as transações
@@ -61,6 +61,8 @@ class RealDataAdapter:
             self.df = pd.read_csv(self.dataset_path)
         elif path.suffix == '.json':
             self.df = pd.read_json(self.dataset_path)
+        elif path.suffix == '.jsonl':
+            self.df = pd.read_json(self.dataset_path, lines=True)
         else:
             raise ValueError(f"Unsupported file format: {path.suffix}")
         
@@ -238,9 +240,10 @@ class RealDataAdapter:
         if not self.devices:
             self.extract_device_profiles()
         
-        events = []
+        # Um evento por linha: lista alocada de uma vez
+        events = [None] * len(self.df)
         
-        for idx, row in self.df.iterrows():
+        for i, (idx, row) in enumerate(self.df.iterrows()):
             user_id_str = row['UserID']
             device_id_str = row['DeviceID']
             
@@ -288,7 +291,7 @@ class RealDataAdapter:
                 'scenario': self._map_scenario_to_id(row.get('FraudScenario')),
             }
             
-            events.append(event)
+            events[i] = event
         
         print(f"✓ Mapped {len(events)} transactions to simulation format")
         
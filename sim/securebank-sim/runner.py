@@ -1,6 +1,5 @@
 # runner.py
 import argparse
-import copy
 import csv
 import hashlib
 import json
@@ -9,17 +8,19 @@ import platform
 import statistics
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from simulator import run_simulation
+from log_io import dump_json, write_logs
 from metrics import (
-    compute_ital,
-    compute_sae,
+    compute_all_metrics,
     compute_scenario_detection,
     compute_stats,
-    compute_tii,
     compute_tii_per_service,
 )
 from plots import generate_plots
@@ -189,8 +190,7 @@ def run_experiment(
         "pip_freeze": _pip_freeze(),
         **_get_git_info(BASE_DIR),
     }
-    with (exp_dir / "run_metadata.json").open("w", encoding="utf-8") as f:
-        json.dump(run_metadata, f, indent=2)
+    dump_json(exp_dir / "run_metadata.json", run_metadata)
 
     # ----------------- Acumuladores -----------------
     runs_metrics: List[Dict[str, Any]] = []
@@ -208,9 +208,9 @@ def run_experiment(
 
     # ----------------- Runs -----------------
     for run_id in range(num_runs):
-        cfg = copy.deepcopy(base_config)
         run_seed = base_seed + run_id
-        cfg["seed"] = run_seed
+        # Cópia rasa: run_simulation só lê a configuração
+        cfg = {**base_config, "seed": run_seed}
 
         baseline_logs, sb_logs = run_simulation(cfg)
 
@@ -226,12 +226,16 @@ def run_experiment(
         total_events_list.append(total_events)
         total_attacks_list.append(total_attacks)
 
-        tii_baseline = float(compute_tii(baseline_logs))
-        tii_sb = float(compute_tii(sb_logs))
-        sae_baseline = float(compute_sae(baseline_logs))
-        sae_sb = float(compute_sae(sb_logs))
-        ital_baseline = float(compute_ital(baseline_logs, ital_params))
-        ital_sb = float(compute_ital(sb_logs, ital_params))
+        # Uma única passada por conjunto de logs (TII, SAE e ITAL juntos)
+        m_baseline = compute_all_metrics(baseline_logs, ital_params)
+        m_sb = compute_all_metrics(sb_logs, ital_params)
+
+        tii_baseline = float(m_baseline["TII"])
+        tii_sb = float(m_sb["TII"])
+        sae_baseline = float(m_baseline["SAE"])
+        sae_sb = float(m_sb["SAE"])
+        ital_baseline = float(m_baseline["ITAL"])
+        ital_sb = float(m_sb["ITAL"])
 
         # Sanidade: métricas fora do esperado
         for name, val in [
@@ -316,11 +320,9 @@ def run_experiment(
         "ITAL": {"baseline": statistics.mean(ital_baseline_vals), "securebank": statistics.mean(ital_sb_vals)},
     }
 
-    with (exp_dir / "summary_results.json").open("w", encoding="utf-8") as f:
-        json.dump(summary_results, f, indent=2)
+    dump_json(exp_dir / "summary_results.json", summary_results)
 
-    with (exp_dir / "results.json").open("w", encoding="utf-8") as f:
-        json.dump(results_for_plots, f, indent=2)
+    dump_json(exp_dir / "results.json", results_for_plots)
 
     # CSV por run
     with (exp_dir / "metrics_runs.csv").open("w", newline="", encoding="utf-8") as f:
@@ -370,44 +372,60 @@ def run_experiment(
         _write_summary_row(w, "ITAL", "baseline", ital_baseline_vals)
         _write_summary_row(w, "ITAL", "securebank", ital_sb_vals)
 
-    # Detalhes e artefatos para runs salvos
-    for i, (b_logs, s_logs) in enumerate(zip(saved_baseline_logs, saved_sb_logs)):
-        with (exp_dir / f"baseline_logs_run{i}.json").open("w", encoding="utf-8") as f:
-            json.dump(b_logs, f, indent=2)
-        with (exp_dir / f"securebank_logs_run{i}.json").open("w", encoding="utf-8") as f:
-            json.dump(s_logs, f, indent=2)
-
-        if logging_cfg.get("save_stats", True):
-            stats = {"baseline": compute_stats(b_logs), "securebank": compute_stats(s_logs)}
-            with (exp_dir / f"stats_run{i}.json").open("w", encoding="utf-8") as f:
-                json.dump(stats, f, indent=2)
-
-        if logging_cfg.get("save_timeline", True):
-            n = len(s_logs)
-            timeline = {
-                "step": list(range(n)),
-                "sb_theta": [ev.get("theta") for ev in s_logs],
-                "sb_risk": [ev.get("risk") for ev in s_logs],
-                "sb_I_before": [ev.get("I_u") for ev in s_logs],
-                "sb_I_after": [ev.get("new_I") for ev in s_logs],
-                "sb_action": [ev.get("action") for ev in s_logs],
-                "is_attack": [bool(ev.get("is_attack")) for ev in s_logs],
-                "baseline_action": [ev.get("action") for ev in b_logs],
-            }
-            with (exp_dir / f"timeline_run{i}.json").open("w", encoding="utf-8") as f:
-                json.dump(timeline, f, indent=2)
-
-        tii_per_service = {"baseline": compute_tii_per_service(b_logs), "securebank": compute_tii_per_service(s_logs)}
-        with (exp_dir / f"tii_per_service_run{i}.json").open("w", encoding="utf-8") as f:
-            json.dump(tii_per_service, f, indent=2)
-
-        scenario_detection = compute_scenario_detection(b_logs, s_logs)
-        with (exp_dir / f"scenario_detection_run{i}.json").open("w", encoding="utf-8") as f:
-            json.dump(scenario_detection, f, indent=2)
-
-    # Plots
-    if logging_cfg.get("save_plots", True):
-        generate_plots(results_for_plots, output_dir=exp_dir)
+    # Gravação dos logs (I/O) roda em threads, sobreposta ao cálculo dos
+    # artefatos abaixo e aos plots. Os plots ficam na thread principal:
+    # pyplot fora dela não é seguro com backends GUI (macOS, Tk, Qt).
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pending = []
+
+        # Detalhes e artefatos para runs salvos
+        for i, (b_logs, s_logs) in enumerate(zip(saved_baseline_logs, saved_sb_logs)):
+            # JSONL (um evento por linha): leitura em streaming via log_io.iter_logs
+            pending.append(executor.submit(write_logs, exp_dir / f"baseline_logs_run{i}.jsonl", b_logs))
+            pending.append(executor.submit(write_logs, exp_dir / f"securebank_logs_run{i}.jsonl", s_logs))
+
+            if logging_cfg.get("save_stats", True):
+                stats = {"baseline": compute_stats(b_logs), "securebank": compute_stats(s_logs)}
+                dump_json(exp_dir / f"stats_run{i}.json", stats)
+
+            if logging_cfg.get("save_timeline", True):
+                n = len(s_logs)
+                timeline = {
+                    "step": list(range(n)),
+                    "sb_theta": [ev.get("theta") for ev in s_logs],
+                    "sb_risk": [ev.get("risk") for ev in s_logs],
+                    "sb_I_before": [ev.get("I_u") for ev in s_logs],
+                    "sb_I_after": [ev.get("new_I") for ev in s_logs],
+                    "sb_action": [ev.get("action") for ev in s_logs],
+                    "is_attack": [bool(ev.get("is_attack")) for ev in s_logs],
+                    "baseline_action": [ev.get("action") for ev in b_logs],
+                }
+                dump_json(exp_dir / f"timeline_run{i}.json", timeline)
+                # Colunas numéricas também em .npz (float32): analysis_plots lê
+                # só o que usa, sem decodificar o JSON inteiro
+                np.savez(
+                    exp_dir / f"timeline_run{i}.npz",
+                    step=np.arange(n, dtype=np.int32),
+                    sb_theta=np.array(timeline["sb_theta"], dtype=np.float32),
+                    sb_risk=np.array(timeline["sb_risk"], dtype=np.float32),
+                    sb_I_before=np.array(timeline["sb_I_before"], dtype=np.float32),
+                    sb_I_after=np.array(timeline["sb_I_after"], dtype=np.float32),
+                    is_attack=np.array(timeline["is_attack"], dtype=bool),
+                )
+
+            tii_per_service = {"baseline": compute_tii_per_service(b_logs), "securebank": compute_tii_per_service(s_logs)}
+            dump_json(exp_dir / f"tii_per_service_run{i}.json", tii_per_service)
+
+            scenario_detection = compute_scenario_detection(b_logs, s_logs)
+            dump_json(exp_dir / f"scenario_detection_run{i}.json", scenario_detection)
+
+        # os plots não dependem dos arquivos de log
+        if logging_cfg.get("save_plots", True):
+            generate_plots(results_for_plots, output_dir=exp_dir)
+
+        # Aguarda gravações pendentes (result() repropaga exceções)
+        for fut in pending:
+            fut.result()
 
     print("\n=== Experiment Finished ===")
     print(f"Results saved to: {exp_dir}")
@@ -23,8 +23,10 @@ import json
 import argparse
 from pathlib import Path
 from datetime import datetime
+from functools import partial
 
-from simulator import run_simulation
+from simulator import run_simulation, run_simulation_batch
+from sim_cache import CachedSimulator
 from advanced_metrics import (
     compute_roi_analysis,
     compute_false_positive_negative_analysis,
@@ -118,7 +120,11 @@ def generate_summary_report(results: dict, output_path: Path):
             
             scal = results["scalability"]
             
-            f.write("Load Testing Results:\n\n")
+            f.write("Load Testing Results:\n")
+            if scal.get("max_workers", 1) > 1:
+                f.write(f"(measured with {scal['max_workers']} concurrent loads: "
+                        "timings include CPU/memory contention)\n")
+            f.write("\n")
             f.write(f"{'Load (tx/day)':<15} {'Latency (ms)':<15} {'Throughput (tps)':<20} ")
             f.write(f"{'CPU (%)':<10} {'Memory (GB)':<12}\n")
             f.write("-" * 70 + "\n")
@@ -200,6 +206,12 @@ def main():
         action='store_true',
         help='Quick mode: skip time-consuming analyses (scalability, sensitivity)'
     )
+    parser.add_argument(
+        '--sim-cache',
+        action='store_true',
+        help='Reuse cached simulation outputs keyed by config hash (.sim_cache/) '
+             'for the baseline run and sensitivity analysis; scalability is always simulated'
+    )
     
     args = parser.parse_args()
     
@@ -225,9 +237,12 @@ def main():
     with open(config_path, 'r') as f:
         config = json.load(f)
     
+    # Simulação (opcionalmente com cache em disco por hash da config)
+    simulate = CachedSimulator(run_simulation) if args.sim_cache else run_simulation
+    
     # Run simulation once to get baseline logs
     print("Running baseline simulation...")
-    baseline_logs, securebank_logs = run_simulation(config)
+    baseline_logs, securebank_logs = simulate(config)
     print(f"  ✓ Generated {len(baseline_logs)} events\n")
     
     # Execute analyses based on mode
@@ -255,6 +270,8 @@ def main():
         print("\n" + "="*70)
         print("SCALABILITY ANALYSIS")
         print("="*70)
+        # Sempre a simulação real: com o cache, o tempo medido seria o de
+        # carregar um pickle e latência/throughput perderiam o sentido
         results["scalability"] = compute_scalability_analysis(
             run_simulation,
             config,
@@ -268,9 +285,12 @@ def main():
         print("SENSITIVITY ANALYSIS")
         print("="*70)
         results["sensitivity"] = compute_sensitivity_analysis(
-            run_simulation,
+            simulate,
             config,
-            num_samples=5
+            num_samples=5,
+            # em lote só sem cache: o cache trabalha por config; as amostras
+            # só precisam de TII/SAE/ITAL, então o lote sai em formato colunar
+            simulator_batch_func=None if args.sim_cache else partial(run_simulation_batch, columnar=True)
         )
         print(f"\n  Critical Params: {', '.join(results['sensitivity']['critical_parameters'])}")
     
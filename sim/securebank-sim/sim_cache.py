@@ -0,0 +1,125 @@
+# sim_cache.py
+"""
+Cache em disco das saídas da simulação, indexado pelo hash da configuração.
+
+As análises de sensibilidade/escalabilidade rodam a simulação para muitas
+configurações; entre execuções da ferramenta várias se repetem. Como
+run_simulation é determinística para uma config (inclui a seed), o par
+(baseline_logs, securebank_logs) pode ser reaproveitado.
+
+A chave inclui um hash do código-fonte do módulo do simulador: editar
+simulator.py invalida as entradas antigas. O diretório é limitado a
+max_bytes (padrão DEFAULT_MAX_BYTES); ao passar do limite, as entradas
+usadas há mais tempo (mtime, atualizado a cada acerto) são removidas.
+
+Uso:
+    simulate = CachedSimulator(run_simulation)
+    baseline_logs, securebank_logs = simulate(config)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # orjson é opcional
+    orjson = None
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".sim_cache"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+def config_hash(config: Dict[str, Any], salt: str = "") -> str:
+    """Hash estável (blake2b) da configuração, independente da ordem das chaves."""
+    if orjson is not None:
+        payload = orjson.dumps(config, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(config, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    h = hashlib.blake2b(payload, digest_size=20)
+    h.update(salt.encode("utf-8"))
+    return h.hexdigest()
+
+
+def code_version(func: Callable) -> str:
+    """Hash do código-fonte do módulo de func (vazio se o fonte não estiver disponível)."""
+    try:
+        source = inspect.getsource(sys.modules[func.__module__])
+    except (KeyError, OSError, TypeError):
+        return ""
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class CachedSimulator:
+    """
+    Envolve uma função de simulação (config -> (baseline_logs, securebank_logs))
+    com um cache em pickle por hash de config.
+
+    É picklable (desde que simulator_func seja uma função de módulo), então
+    pode ser passado para compute_sensitivity_analysis / ProcessPoolExecutor.
+    """
+
+    def __init__(
+        self,
+        simulator_func: Callable,
+        cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.simulator_func = simulator_func
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        # a mesma config com outro simulador (ou outra versão do código) não pode colidir
+        self._salt = (f"{simulator_func.__module__}.{simulator_func.__qualname__}"
+                      f"@{code_version(simulator_func)}")
+
+    def path_for(self, config: Dict[str, Any]) -> Path:
+        return self.cache_dir / f"{config_hash(config, self._salt)}.pkl"
+
+    def __call__(self, config: Dict[str, Any]) -> Tuple[List[Dict], List[Dict]]:
+        path = self.path_for(config)
+        if path.exists():
+            try:
+                with path.open("rb") as f:
+                    result = pickle.load(f)
+                os.utime(path)  # marca como usada recentemente (ver _evict)
+                return result
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass  # entrada corrompida/incompleta: refaz a simulação
+
+        result = self.simulator_func(config)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # grava em arquivo temporário e renomeia: leitores concorrentes
+        # (outros processos) nunca veem um pickle pela metade
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self._evict()
+        return result
+
+    def _evict(self) -> None:
+        """Remove as entradas menos recentes até o diretório caber em max_bytes."""
+        entries = []
+        for entry in self.cache_dir.glob("*.pkl"):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # removida por outro processo
+            entries.append((st.st_mtime, st.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
@@ -306,7 +306,47 @@ def run_simulation(config):
     seed = config.get("seed", 42)
     random.seed(seed)
 
-    # Parâmetros vindos do JSON (com defaults)
+    params = _simulation_params(config)
+    users, devices_by_owner = _generate_population()
+
+    return _simulate_logs(params, users, devices_by_owner)
+
+
+def run_simulation_batch(configs, columnar=False):
+    """
+    Executa run_simulation para uma lista de configs numa única chamada.
+
+    A população (users/devices) é gerada uma vez por seed: nas chamadas
+    seguintes com a mesma seed o estado do RNG logo após a geração é
+    restaurado, então cada resultado é idêntico a run_simulation(config).
+
+    Retorna uma lista de (baseline_logs, securebank_logs), na ordem de configs.
+    Com columnar=True cada par vem no formato de run_simulation_columnar
+    (para quem só precisa das métricas).
+    """
+    simulate = _simulate_arrays if columnar else _simulate_logs
+    populations = {}
+    results = []
+
+    for config in configs:
+        seed = config.get("seed", 42)
+        cached = populations.get(seed)
+        if cached is None:
+            random.seed(seed)
+            users, devices_by_owner = _generate_population()
+            populations[seed] = (users, devices_by_owner, random.getstate())
+        else:
+            users, devices_by_owner, rng_state = cached
+            random.setstate(rng_state)
+
+        params = _simulation_params(config)
+        results.append(simulate(params, users, devices_by_owner))
+
+    return results
+
+
+def _simulation_params(config):
+    """Parâmetros do laço de eventos vindos do JSON (com defaults)."""
     num_events = config.get("num_events", NUM_STEPS)
     attack_prob = config.get("attack_probability", ATTACK_PROB)
 
@@ -323,6 +363,11 @@ def run_simulation(config):
     }
     active_scenarios = [sid for sid, enabled in scenario_flags.items() if enabled]
 
+    return num_events, attack_prob, ital_params, active_scenarios
+
+
+def _generate_population():
+    """Gera usuários e devices (consome o RNG global) e indexa devices por dono."""
     users = generate_users()
     devices = generate_devices(users)
 
@@ -331,13 +376,31 @@ def run_simulation(config):
     for d in devices:
         devices_by_owner[d["owner_id"]].append(d)
 
+    return users, devices_by_owner
+
+
+def _simulate_logs(params, users, devices_by_owner):
+    """Logs no formato de dicts: {**event, **decision} por política."""
     baseline_logs = []
     securebank_logs = []
 
+    def emit(i, event, base_decision, sb_decision):
+        baseline_logs.append({**event, **base_decision})
+        securebank_logs.append({**event, **sb_decision})
+
+    _simulate_events(*params, users, devices_by_owner, emit)
+    return baseline_logs, securebank_logs
+
+
+def _simulate_events(num_events, attack_prob, ital_params, active_scenarios, users, devices_by_owner, emit):
+    """
+    Laço de eventos da simulação (RNG já posicionado após a população).
+    Para cada evento i chama emit(i, event, base_decision, sb_decision).
+    """
     # Estado interno do SecureBank™ (confiança + perfil de identidade)
     sb_state = {"I": {}, "D": {}, "profiles": {}}
 
-    for _ in range(num_events):
+    for i in range(num_events):
         user = random.choice(users)
         user_devices = devices_by_owner[user["id"]]
         device = random.choice(user_devices)
@@ -364,13 +427,60 @@ def run_simulation(config):
 
         # Baseline
         base_decision = baseline_pdp(event)
-        baseline_logs.append({**event, **base_decision})
 
         # SecureBank
         sb_decision = securebank_pdp(event, sb_state, ital_params)
-        securebank_logs.append({**event, **sb_decision})
 
-    return baseline_logs, securebank_logs
+        emit(i, event, base_decision, sb_decision)
+
+
+def run_simulation_columnar(config):
+    """
+    Mesma simulação de run_simulation, mas sem montar um dict por evento:
+    cada política grava direto num array estruturado pré-alocado
+    (metrics_np.LOG_DTYPE).
+
+    Retorna (baseline, securebank) já no formato de metrics_np.logs_to_arrays,
+    aceito diretamente por todas as métricas de metrics_np. Para persistir
+    logs completos (JSONL) continue usando run_simulation.
+    """
+    seed = config.get("seed", 42)
+    random.seed(seed)
+
+    params = _simulation_params(config)
+    users, devices_by_owner = _generate_population()
+
+    return _simulate_arrays(params, users, devices_by_owner)
+
+
+def _simulate_arrays(params, users, devices_by_owner):
+    """Logs colunares: um registro metrics_np.LOG_DTYPE por evento e política."""
+    import numpy as np
+    import metrics_np
+
+    num_events = params[0]
+    base_rec = np.empty(num_events, dtype=metrics_np.LOG_DTYPE)
+    sb_rec = np.empty(num_events, dtype=metrics_np.LOG_DTYPE)
+    service_code = {s: k for k, s in enumerate(SERVICES)}
+    action_code = metrics_np.ACTION_CODES
+    nan = float("nan")
+
+    def emit(i, event, base_decision, sb_decision):
+        tx = event["tx"]
+        is_attack = event["is_attack"]
+        s = service_code.get(tx["service"], -1)
+        uid = tx["user_id"]
+        base_rec[i] = (is_attack, base_decision["allowed"], action_code[base_decision["action"]],
+                       s, uid, nan, nan)
+        sb_rec[i] = (is_attack, sb_decision["allowed"], action_code[sb_decision["action"]],
+                     s, uid, sb_decision["I_u"], sb_decision["new_I"])
+
+    _simulate_events(*params, users, devices_by_owner, emit)
+
+    return (
+        metrics_np.records_to_arrays(base_rec, SERVICES, len(users)),
+        metrics_np.records_to_arrays(sb_rec, SERVICES, len(users)),
+    )
 
 
 def run_simulation_with_pdp(config, pdp_func, pdp_state=None):
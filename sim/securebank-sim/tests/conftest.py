@@ -0,0 +1,29 @@
+# conftest.py
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SIM_DIR = Path(__file__).resolve().parent.parent
+
+# os módulos da simulação são importados pelo nome (ex.: "import simulator")
+sys.path.insert(0, str(SIM_DIR))
+
+
+@pytest.fixture(scope="session")
+def config():
+    """config.json com menos eventos e mais ataques (cobre todos os cenários)."""
+    with open(SIM_DIR / "config.json", "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg["num_events"] = 3000
+    cfg["attack_probability"] = 0.25
+    return cfg
+
+
+@pytest.fixture(scope="session")
+def sim_logs(config):
+    """(baseline_logs, securebank_logs) do caminho por evento de simulator.py."""
+    from simulator import run_simulation
+    return run_simulation(copy.deepcopy(config))
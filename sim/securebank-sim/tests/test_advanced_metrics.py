@@ -0,0 +1,37 @@
+# test_advanced_metrics.py
+"""
+Memo de advanced_metrics (compute_roi_analysis e
+compute_false_positive_negative_analysis): acertos devolvem o mesmo
+resultado e o dict retornado pode ser modificado sem afetar o memo.
+"""
+import copy
+
+import pytest
+
+import advanced_metrics
+from advanced_metrics import compute_false_positive_negative_analysis, compute_roi_analysis
+
+
+@pytest.fixture(autouse=True)
+def _fresh_analysis_cache():
+    advanced_metrics.clear_analysis_cache()
+    yield
+    advanced_metrics.clear_analysis_cache()
+
+
+@pytest.mark.parametrize("analysis", [compute_roi_analysis, compute_false_positive_negative_analysis])
+def test_memoized_result_is_not_shared(analysis, sim_logs):
+    first = analysis(*sim_logs)
+    expected = copy.deepcopy(first)
+    assert len(advanced_metrics._analysis_cache) == 1
+
+    # modifica o primeiro resultado em todos os níveis
+    for value in first.values():
+        if isinstance(value, dict):
+            value.clear()
+    first.clear()
+
+    second = analysis(*sim_logs)
+    assert len(advanced_metrics._analysis_cache) == 1  # acerto no memo
+    assert second == expected
+    assert second is not first
@@ -0,0 +1,134 @@
+# test_metrics_np.py
+"""
+metrics_np.compute_all_metrics (redutor numba e fallback NumPy) contra
+metrics.compute_tii / compute_sae / compute_ital, para os três produtores
+de arrays: logs em dicts, pdp_np (colunar) e simulator.run_simulation_columnar.
+"""
+import copy
+
+import numpy as np
+import pytest
+
+import metrics
+import metrics_np
+import pdp_np
+from simulator import run_simulation, run_simulation_batch, run_simulation_columnar
+
+# TII é um produto escalar (pesos @ contagens) em metrics_np e uma soma
+# sequencial em metrics.py: pode diferir no último bit
+REL = 1e-12
+
+
+@pytest.fixture(autouse=True)
+def _fresh_arrays_cache():
+    metrics_np.clear_arrays_cache()
+    yield
+    metrics_np.clear_arrays_cache()
+
+
+@pytest.fixture(params=["compiled", "numpy"])
+def reducer(request, monkeypatch):
+    """Roda cada teste com o redutor numba e com o fallback NumPy."""
+    if request.param == "compiled":
+        if metrics_np._reduce_events is None:
+            pytest.skip("numba não instalado")
+    else:
+        monkeypatch.setattr(metrics_np, "_reduce_events", None)
+    return request.param
+
+
+def _expected(logs, ital_params):
+    return {
+        "TII": metrics.compute_tii(logs),
+        "SAE": metrics.compute_sae(logs),
+        "ITAL": metrics.compute_ital(logs, ital_params),
+    }
+
+
+def _assert_metrics(got, expected):
+    assert got["TII"] == pytest.approx(expected["TII"], rel=REL)
+    assert got["SAE"] == pytest.approx(expected["SAE"], rel=REL)
+    assert got["ITAL"] == pytest.approx(expected["ITAL"], rel=REL)
+
+
+def test_compute_all_metrics_matches_metrics_on_logs(reducer, config, sim_logs):
+    ital_params = config["ital_params"]
+    for logs in sim_logs:
+        _assert_metrics(metrics_np.compute_all_metrics(logs, ital_params), _expected(logs, ital_params))
+
+
+def test_vectorized_metrics_match_metrics_on_logs(config, sim_logs):
+    ital_params = config["ital_params"]
+    for logs in sim_logs:
+        got = {
+            "TII": metrics_np.compute_tii(logs),
+            "SAE": metrics_np.compute_sae(logs),
+            "ITAL": metrics_np.compute_ital(logs, ital_params),
+        }
+        _assert_metrics(got, _expected(logs, ital_params))
+
+
+def test_compute_all_metrics_default_ital_params(reducer, sim_logs):
+    for logs in sim_logs:
+        _assert_metrics(metrics_np.compute_all_metrics(logs), _expected(logs, None))
+
+
+def test_compute_all_metrics_on_empty_logs(reducer):
+    assert metrics_np.compute_all_metrics([]) == {"TII": 0.0, "SAE": 0.0, "ITAL": 0.0}
+    assert metrics.compute_all_metrics([]) == {"TII": 0.0, "SAE": 0.0, "ITAL": 0.0}
+
+
+def test_compute_all_metrics_on_pdp_np_arrays(reducer, config, sim_logs):
+    ital_params = config["ital_params"]
+    events = [{k: log[k] for k in ("user", "device", "tx", "ctx", "scenario", "is_attack")}
+              for log in sim_logs[1]]
+    arrays = pdp_np.events_to_arrays(events)
+    base_arrays, sb_arrays = pdp_np.metrics_arrays(arrays, pdp_np.run_pdps(arrays, ital_params))
+
+    for got_arrays, logs in zip((base_arrays, sb_arrays), sim_logs):
+        _assert_metrics(metrics_np.compute_all_metrics(got_arrays, ital_params), _expected(logs, ital_params))
+
+
+def test_run_simulation_columnar_matches_run_simulation(reducer, config, sim_logs):
+    ital_params = config["ital_params"]
+    columnar = run_simulation_columnar(copy.deepcopy(config))
+
+    for got_arrays, logs in zip(columnar, sim_logs):
+        assert got_arrays["n"] == len(logs)
+        _assert_metrics(metrics_np.compute_all_metrics(got_arrays, ital_params), _expected(logs, ital_params))
+        assert (metrics_np.compute_confusion_matrix(got_arrays)
+                == metrics_np.compute_confusion_matrix(logs))
+
+
+def test_run_simulation_batch_matches_run_simulation(config):
+    configs = []
+    for seed, num_events in ((42, 400), (7, 300), (42, 250)):
+        cfg = copy.deepcopy(config)
+        cfg["seed"] = seed
+        cfg["num_events"] = num_events
+        configs.append(cfg)
+
+    expected = [run_simulation(copy.deepcopy(cfg)) for cfg in configs]
+
+    assert run_simulation_batch(configs) == expected
+
+
+def test_run_simulation_batch_columnar_matches_columnar(config):
+    configs = []
+    for seed, num_events in ((42, 400), (42, 250)):
+        cfg = copy.deepcopy(config)
+        cfg["seed"] = seed
+        cfg["num_events"] = num_events
+        configs.append(cfg)
+
+    batch = run_simulation_batch(configs, columnar=True)
+
+    for cfg, got in zip(configs, batch):
+        expected = run_simulation_columnar(copy.deepcopy(cfg))
+        for got_arrays, expected_arrays in zip(got, expected):
+            assert got_arrays.keys() == expected_arrays.keys()
+            for k, v in expected_arrays.items():
+                if isinstance(v, np.ndarray):
+                    np.testing.assert_array_equal(got_arrays[k], v)
+                else:
+                    assert got_arrays[k] == v
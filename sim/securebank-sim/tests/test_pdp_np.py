@@ -0,0 +1,142 @@
+# test_pdp_np.py
+"""
+pdp_np (kernel compilado e fallback em Python) contra os PDPs de
+simulator.py aplicados evento a evento: decisões, valores e chaves dos
+logs devem ser idênticos.
+"""
+import random
+
+import pytest
+
+import pdp_np
+from simulator import baseline_pdp, securebank_pdp
+
+EVENT_KEYS = ("user", "device", "tx", "ctx", "scenario", "is_attack")
+
+# limiares das regras de baseline_pdp / securebank_pdp (e vizinhanças)
+AMOUNTS = [0.0, 15.0, 1999.0, 2000.0, 2500.0, 3000.0, 3500.0, 5000.0, 6000.0,
+           7500.0, 9500.0, 15000.0, 18000.0, 20000.0, 25000.0, 40000.0, 90000.0]
+GEOS = ["US-FL", "US-NY", "US-CA", "BR-SP", "RU", "CN", "NG", "DE", "IN"]
+SERVICES = ["payments", "settlement", "risk_analytics", "aml", "customer_identity"]
+
+
+def _events_from_logs(logs):
+    return [{k: log[k] for k in EVENT_KEYS} for log in logs]
+
+
+def _edge_events(n=1500, seed=7):
+    """Eventos sintéticos que passam por todos os limiares das regras."""
+    rng = random.Random(seed)
+    users = [{"id": f"user_{i}", "base_risk": rng.uniform(0.0, 0.5)} for i in range(40)]
+    users.append({"id": "user_no_risk"})  # base_risk ausente: default 0.2
+    events = []
+    for _ in range(n):
+        user = rng.choice(users)
+        amount = rng.choice(AMOUNTS) if rng.random() < 0.6 else rng.lognormvariate(6.0, 2.0)
+        is_attack = rng.random() < 0.2
+        events.append({
+            "user": user,
+            "device": {"id": f"dev_{rng.randrange(60)}"},
+            "tx": {"user_id": user["id"], "service": rng.choice(SERVICES), "amount": amount},
+            "ctx": {"geo": rng.choice(GEOS), "hour": rng.randrange(24),
+                    "channel": rng.choice(["web", "mobile", "api"])},
+            "scenario": rng.randint(1, 5) if is_attack else None,
+            "is_attack": is_attack,
+        })
+    return events
+
+
+def _reference_logs(events, ital_params):
+    """Caminho por evento (o mesmo laço de simulator.run_simulation)."""
+    state = {"I": {}, "D": {}, "profiles": {}}
+    baseline_logs, securebank_logs = [], []
+    for event in events:
+        baseline_logs.append({**event, **baseline_pdp(event)})
+        securebank_logs.append({**event, **securebank_pdp(event, state, ital_params)})
+    return baseline_logs, securebank_logs
+
+
+def _columnar_logs(events, ital_params):
+    decisions = pdp_np.run_pdps(pdp_np.events_to_arrays(events), ital_params)
+    return pdp_np.merged_logs(events, decisions)
+
+
+@pytest.fixture(params=["compiled", "python"])
+def kernel(request, monkeypatch):
+    """Roda cada teste com o kernel numba e com o fallback em Python."""
+    if request.param == "compiled":
+        if pdp_np.run_pdps_kernel is None:
+            pytest.skip("numba não instalado")
+    else:
+        monkeypatch.setattr(pdp_np, "run_pdps_kernel", None)
+    return request.param
+
+
+def _assert_same_logs(got, expected):
+    got = list(got)
+    assert len(got) == len(expected)
+    for i, (g, e) in enumerate(zip(got, expected)):
+        assert g == e, f"evento {i}"
+        assert list(g) == list(e), f"ordem das chaves, evento {i}"
+
+
+def test_run_pdps_matches_simulator_logs(kernel, config, sim_logs):
+    baseline_logs, securebank_logs = sim_logs
+    events = _events_from_logs(securebank_logs)
+
+    base, sb = _columnar_logs(events, config["ital_params"])
+
+    _assert_same_logs(base, baseline_logs)
+    _assert_same_logs(sb, securebank_logs)
+
+
+@pytest.mark.parametrize("ital_params", [
+    {},
+    {"identity_drift_factor": 0.8, "trust_decay": 0.12, "trust_growth": 0.25},
+    {"identity_drift_factor": 0.05, "trust_decay": 0.5, "trust_growth": 0.05},
+])
+def test_run_pdps_matches_per_event_pdps_on_edge_cases(kernel, ital_params):
+    events = _edge_events()
+    expected_base, expected_sb = _reference_logs(events, ital_params)
+
+    base, sb = _columnar_logs(events, ital_params)
+
+    _assert_same_logs(base, expected_base)
+    _assert_same_logs(sb, expected_sb)
+    # todas as ações aparecem nos dois PDPs (os limiares foram exercitados)
+    assert {log["action"] for log in expected_base} == set(pdp_np.ACTION_NAMES)
+    assert {log["action"] for log in expected_sb} == set(pdp_np.ACTION_NAMES)
+
+
+def test_merged_logs_sequence_access():
+    events = _edge_events(n=50)
+    expected_base, expected_sb = _reference_logs(events, {})
+    base, sb = _columnar_logs(events, {})
+
+    for logs, expected in ((base, expected_base), (sb, expected_sb)):
+        assert len(logs) == len(expected)
+        assert logs[0] == expected[0]
+        assert logs[-1] == expected[-1]
+        assert logs[10:20] == expected[10:20]
+        assert logs[::7] == expected[::7]
+        assert logs[-5:] == expected[-5:]
+        assert logs[40:10] == []
+        assert list(logs) == expected
+        with pytest.raises(IndexError):
+            logs[len(expected)]
+
+
+def test_merged_logs_build_new_dicts():
+    events = _edge_events(n=5)
+    base, _ = _columnar_logs(events, {})
+
+    log = base[0]
+    log["action"] = "changed"
+    assert base[0]["action"] != "changed"
+    assert "action" not in events[0]
+
+
+def test_empty_events():
+    base, sb = _columnar_logs([], {})
+    assert len(base) == 0 and len(sb) == 0
+    assert list(base) == [] and base[:3] == []